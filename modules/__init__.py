@@ -1,8 +1,17 @@
 import os
+import json
 import time
+import functools
+import threading
+import asyncio
+from datetime import date, time as dt_time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from mcp.server.fastmcp import FastMCP # type: ignore
 from plexapi.server import PlexServer # type: ignore
 from plexapi.myplex import MyPlexAccount # type: ignore
+from plexapi.exceptions import Unauthorized # type: ignore
 
 # Environment initialization is handled by plex_mcp_server.py
 
@@ -13,52 +22,153 @@ mcp = FastMCP("plex-server")
 plex_url = os.environ.get("PLEX_URL", "")
 plex_token = os.environ.get("PLEX_TOKEN", "")
 server = None
+server_key = None
 last_connection_time = 0
 CONNECTION_TIMEOUT = 30  # seconds
 SESSION_TIMEOUT = 60 * 30  # 30 minutes
+CONNECTION_CHECK_INTERVAL = 60  # seconds between liveness checks of a cached connection
+_connection_lock = threading.Lock()
+HTTP_POOL_SIZE = 32  # concurrent connections kept open to the Plex server
+
+def _create_plex_session() -> requests.Session:
+    """Create the HTTP session used by PlexServer.
+    
+    The pool is sized for the concurrent requests tools issue through
+    asyncio.gather, and idempotent requests are retried on gateway errors.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
 def connect_to_plex() -> PlexServer:
     """Connect to Plex server using environment variables or stored credentials.
     
-    Returns a PlexServer instance with automatic reconnection if needed.
+    Returns a cached PlexServer instance, reconnecting when the URL or token
+    changes, the session has expired, or the connection stops responding.
     """
-    global server, last_connection_time
-    current_time = time.time()
+    global server, server_key, last_connection_time
     
-    # Check if we have a valid connection
-    if server is not None:
-        # If we've connected recently, reuse the connection
-        if current_time - last_connection_time < SESSION_TIMEOUT:
-            # Verify the connection is still alive with a simple request
+    with _connection_lock:
+        current_time = time.time()
+        connection_key = (plex_url, plex_token)
+        
+        # Check if we have a valid connection for the current credentials
+        if server is not None and server_key == connection_key:
+            elapsed = current_time - last_connection_time
+            
+            # Connection was verified recently, reuse it without another round-trip
+            if elapsed < CONNECTION_CHECK_INTERVAL:
+                return server
+            
+            # If we've connected recently, reuse the connection
+            if elapsed < SESSION_TIMEOUT:
+                # Verify the connection is still alive with a simple request
+                try:
+                    # Query the sections endpoint directly to verify the connection and token;
+                    # server.library.sections() is cached by plexapi and wouldn't reach the server
+                    server.query('/library/sections')
+                    last_connection_time = current_time
+                    return server
+                except Exception:
+                    # Connection failed, reset and create a new one
+                    server = None
+        
+        # Create a new connection
+        max_retries = 3
+        retry_delay = 2  # seconds
+        
+        for attempt in range(max_retries):
             try:
-                # Simple API call to verify the connection
-                server.library.sections()
+                # Connect directly with URL and token
+                if not plex_url or not plex_token:
+                    raise ValueError("PLEX_URL and PLEX_TOKEN are required")
+                
+                server = PlexServer(plex_url, plex_token, session=_create_plex_session(), timeout=CONNECTION_TIMEOUT)
+                server_key = connection_key
                 last_connection_time = current_time
                 return server
-            except:
-                # Connection failed, reset and create a new one
-                server = None
+                
+            except Exception as e:
+                if attempt == max_retries - 1:  # Last attempt failed
+                    raise ValueError(f"Failed to connect to Plex after {max_retries} attempts: {str(e)}")
+                
+                # Wait before retrying
+                time.sleep(retry_delay)
+        
+        # We shouldn't get here but just in case
+        raise ValueError("Failed to connect to Plex server")
+
+async def connect_to_plex_async() -> PlexServer:
+    """Return the shared PlexServer, connecting in a worker thread so the event loop is never blocked."""
+    return await asyncio.to_thread(connect_to_plex)
+
+def reset_plex_connection() -> None:
+    """Drop the cached Plex connection so the next call reconnects.
     
-    # Create a new connection
-    max_retries = 3
-    retry_delay = 2  # seconds
+    Use after authentication errors or when the server token has been rotated.
+    """
+    global server, server_key, last_connection_time
     
-    for attempt in range(max_retries):
-        try:
-            # Connect directly with URL and token
-            if not plex_url or not plex_token:
-                raise ValueError("PLEX_URL and PLEX_TOKEN are required")
-            
-            server = PlexServer(plex_url, plex_token, timeout=CONNECTION_TIMEOUT)
-            last_connection_time = current_time
-            return server
-            
-        except Exception as e:
-            if attempt == max_retries - 1:  # Last attempt failed
-                raise ValueError(f"Failed to connect to Plex after {max_retries} attempts: {str(e)}")
-            
-            # Wait before retrying
-            time.sleep(retry_delay)
+    with _connection_lock:
+        server = None
+        server_key = None
+        last_connection_time = 0
+
+def loaded_attr(obj, name: str, default=None):
+    """Return an attribute of a plexapi object only if it was already loaded.
+    
+    Reads the instance __dict__: getattr on an unset attribute of a partial object
+    makes plexapi reload it from the server, one request per object.
+    """
+    return obj.__dict__.get(name, default)
+
+def retry_on_unauthorized(on_error):
+    """Decorate a tool so a rejected token reconnects and retries the call once.
     
-    # We shouldn't get here but just in case
-    raise ValueError("Failed to connect to Plex server")
+    The tool has to let Unauthorized propagate. If the retry is rejected as well,
+    the response is on_error(exception), in the tool's own error format.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            for _ in range(2):
+                try:
+                    return await func(*args, **kwargs)
+                except Unauthorized as e:
+                    # Token was revoked or rotated; drop the cached connection so the next attempt reconnects
+                    reset_plex_connection()
+                    error = e
+            return on_error(error)
+        return wrapper
+    return decorator
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # optional, the stdlib encoder is used without it
+    orjson = None
+
+def _json_default(obj):
+    """Encode dates and times for both encoders; orjson hands them here too so the output can't drift."""
+    if isinstance(obj, (date, dt_time)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# Compact JSON for tool responses; indentation only adds bytes the client has to parse
+_json_dump = functools.partial(json.dumps, separators=(",", ":"), ensure_ascii=False, default=_json_default)
+
+def dump_json(obj) -> str:
+    """Serialize a tool response to compact JSON, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_json_default,
+                                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME).decode()
+        except TypeError:
+            # Types orjson rejects (e.g. integers beyond 64 bits) go through the stdlib encoder
+            pass
+    return _json_dump(obj)
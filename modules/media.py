@@ -1,9 +1,70 @@
-from modules import mcp, connect_to_plex
+from modules import mcp, connect_to_plex, loaded_attr as _attr
 from typing import List
 from plexapi.exceptions import NotFound # type: ignore
+import asyncio
 import base64
 import os
 import json
+import time
+import requests
+
+# Shared HTTP session for direct Plex API requests so repeated searches reuse the connection
+_http = requests.Session()
+
+# Recent media_search responses, keyed by (query, content_type)
+_SEARCH_CACHE = {}
+SEARCH_CACHE_TTL = 10  # seconds
+SEARCH_CACHE_MAX_ENTRIES = 256
+
+def _cache_search_result(key, result: str) -> None:
+    """Store a media_search response, dropping expired entries once the cache is full."""
+    now = time.monotonic()
+    if len(_SEARCH_CACHE) >= SEARCH_CACHE_MAX_ENTRIES:
+        for stale_key in [k for k, (ts, _) in _SEARCH_CACHE.items() if now - ts >= SEARCH_CACHE_TTL]:
+            del _SEARCH_CACHE[stale_key]
+        if len(_SEARCH_CACHE) >= SEARCH_CACHE_MAX_ENTRIES:
+            # Still full of fresh entries; evict the oldest
+            del _SEARCH_CACHE[next(iter(_SEARCH_CACHE))]
+    _SEARCH_CACHE[key] = (now, result)
+
+# Type-specific fields pulled from each /library/search result in media_search
+_SEARCH_TYPE_FIELDS = {
+    'movie': lambda item: {
+        "year": item.get('year'),
+        "rating": item.get('rating'),
+        "summary": item.get('summary')
+    },
+    'show': lambda item: {
+        "year": item.get('year'),
+        "summary": item.get('summary')
+    },
+    'season': lambda item: {
+        "show_title": item.get('parentTitle', 'Unknown Show'),
+        "season_number": item.get('index')
+    },
+    'episode': lambda item: {
+        "show_title": item.get('grandparentTitle', 'Unknown Show'),
+        "season_number": item.get('parentIndex'),
+        "episode_number": item.get('index')
+    },
+    'track': lambda item: {
+        "artist": item.get('grandparentTitle', 'Unknown Artist'),
+        "album": item.get('parentTitle', 'Unknown Album'),
+        "track_number": item.get('index'),
+        "duration": item.get('duration'),
+        "library": item.get('librarySectionTitle')
+    },
+    'album': lambda item: {
+        "artist": item.get('parentTitle', 'Unknown Artist'),
+        "year": item.get('parentYear'),
+        "library": item.get('librarySectionTitle')
+    },
+    'artist': lambda item: {
+        "art": item.get('art'),
+        "thumb": item.get('thumb'),
+        "library": item.get('librarySectionTitle')
+    },
+}
 
 @mcp.tool()
 async def media_search(query: str, content_type: str = None) -> str:
@@ -13,8 +74,13 @@ async def media_search(query: str, content_type: str = None) -> str:
         query: Search term to look for
         content_type: Optional content type to limit search to (movie, show, episode, track, album, artist or use comma-separated values for HTTP API like movies,music,tv)
     """
+    # Agents often repeat a search within a few seconds; answer those from the cache
+    cache_key = (query, content_type)
+    cached = _SEARCH_CACHE.get(cache_key)
+    if cached and time.monotonic() - cached[0] < SEARCH_CACHE_TTL:
+        return cached[1]
+    
     try:
-        import requests
         from urllib.parse import quote, urlencode
 
         # Get Plex URL and token from environment
@@ -69,7 +135,7 @@ async def media_search(query: str, content_type: str = None) -> str:
         search_url = f"{plex_url}/library/search?{urlencode(params)}"
         
         # Make the request
-        response = requests.get(search_url, headers=headers, timeout=10)
+        response = _http.get(search_url, headers=headers, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -86,6 +152,10 @@ async def media_search(query: str, content_type: str = None) -> str:
         results_by_type = {}
         total_count = 0
         
+        # When a single content_type is specified (mapped or not), only return that exact type;
+        # comma-separated searchTypes are left to the server
+        wanted_type = content_type if content_type and ',' not in content_type else None
+        
         for search_result in data['MediaContainer']['SearchResult']:
             if 'Metadata' not in search_result:
                 continue
@@ -93,17 +163,8 @@ async def media_search(query: str, content_type: str = None) -> str:
             item = search_result['Metadata']
             item_type = item.get('type', 'unknown')
             
-            # Apply additional filter only when content_type is specified and not comma-separated
-            # This is to ensure we only return the exact type the user asked for
-            if content_type and ',' not in content_type and content_type not in content_type_map:
-                if item_type != content_type:
-                    continue
-            
-            # When specific content_type is requested but internal mapping is used,
-            # ensure we only return that specific type
-            if content_type and content_type in content_type_map and ',' not in content_type:
-                if content_type != item_type:
-                    continue
+            if wanted_type and item_type != wanted_type:
+                continue
             
             if item_type not in results_by_type:
                 results_by_type[item_type] = []
@@ -115,40 +176,9 @@ async def media_search(query: str, content_type: str = None) -> str:
                 "rating_key": item.get('ratingKey')
             }
             
-            if item_type == 'movie':
-                formatted_item["year"] = item.get('year')
-                formatted_item["rating"] = item.get('rating')
-                formatted_item["summary"] = item.get('summary')
-                
-            elif item_type == 'show':
-                formatted_item["year"] = item.get('year')
-                formatted_item["summary"] = item.get('summary')
-                
-            elif item_type == 'season':
-                formatted_item["show_title"] = item.get('parentTitle', 'Unknown Show')
-                formatted_item["season_number"] = item.get('index')
-                
-            elif item_type == 'episode':
-                formatted_item["show_title"] = item.get('grandparentTitle', 'Unknown Show')
-                formatted_item["season_number"] = item.get('parentIndex')
-                formatted_item["episode_number"] = item.get('index')
-                
-            elif item_type == 'track':
-                formatted_item["artist"] = item.get('grandparentTitle', 'Unknown Artist')
-                formatted_item["album"] = item.get('parentTitle', 'Unknown Album')
-                formatted_item["track_number"] = item.get('index')
-                formatted_item["duration"] = item.get('duration')
-                formatted_item["library"] = item.get('librarySectionTitle')
-                
-            elif item_type == 'album':
-                formatted_item["artist"] = item.get('parentTitle', 'Unknown Artist')
-                formatted_item["year"] = item.get('parentYear')
-                formatted_item["library"] = item.get('librarySectionTitle')
-                
-            elif item_type == 'artist':
-                formatted_item["art"] = item.get('art')
-                formatted_item["thumb"] = item.get('thumb')
-                formatted_item["library"] = item.get('librarySectionTitle')
+            type_fields = _SEARCH_TYPE_FIELDS.get(item_type)
+            if type_fields:
+                formatted_item.update(type_fields(item))
             
             # Add any media info if available
             if 'Media' in item:
@@ -189,7 +219,7 @@ async def media_search(query: str, content_type: str = None) -> str:
             if type_name not in ordered_results:
                 ordered_results[type_name] = results_by_type[type_name]
         
-        return json.dumps({
+        result = json.dumps({
             "status": "success",
             "message": f"Found {total_count} results for '{query}'",
             "query": query,
@@ -197,6 +227,8 @@ async def media_search(query: str, content_type: str = None) -> str:
             "total_count": total_count,
             "results_by_type": ordered_results
         }, indent=2)
+        _cache_search_result(cache_key, result)
+        return result
     except Exception as e:
         return json.dumps({
             "status": "error",
@@ -247,39 +279,31 @@ async def media_get_details(media_title: str = None, media_id: int = None, libra
                     # Get all music libraries
                     music_libraries = [section for section in plex.library.sections() if section.type == 'artist']
                     
-                    # Search in each music library
-                    for library in music_libraries:
-                        # Try searching for tracks
-                        track_results = library.search(query=media_title, libtype='track')
-                        results.extend(track_results)
-                        
-                        # Try searching for albums
-                        album_results = library.search(query=media_title, libtype='album')
-                        results.extend(album_results)
-                        
-                        # Try searching for artists
-                        artist_results = library.search(query=media_title, libtype='artist')
-                        results.extend(artist_results)
+                    # Search each music library for tracks, albums and artists concurrently;
+                    # gather keeps the results in the same order as a sequential search
+                    typed_results = await asyncio.gather(*[
+                        asyncio.to_thread(library.search, query=media_title, libtype=libtype)
+                        for library in music_libraries
+                        for libtype in ('track', 'album', 'artist')
+                    ])
+                    for typed in typed_results:
+                        results.extend(typed)
             
             if not results:
                 return json.dumps({"error": f"No media found matching '{media_title}'."}, indent=4)
             
             # Multiple results handling - return all matches
             if len(results) > 1:
-                simplified_results = []
-                for item in results:
-                    try:
-                        simplified_results.append({
-                            'title': getattr(item, 'title', 'Unknown'),
-                            'type': getattr(item, 'type', 'unknown'),
-                            'id': getattr(item, 'ratingKey', None)
-                        })
-                    except Exception as item_error:
-                        # Skip items that cause errors
-                        continue
-                
                 # Only return results that have valid data
-                simplified_results = [item for item in simplified_results if item['id'] is not None]
+                simplified_results = [
+                    {
+                        'title': _attr(item, 'title') or 'Unknown',
+                        'type': _attr(item, 'type') or 'unknown',
+                        'id': _attr(item, 'ratingKey')
+                    }
+                    for item in results
+                    if _attr(item, 'ratingKey') is not None
+                ]
                 
                 if simplified_results:
                     return json.dumps(simplified_results, indent=4)
@@ -293,22 +317,17 @@ async def media_get_details(media_title: str = None, media_id: int = None, libra
     except Exception as e:
         return json.dumps({"error": f"Error getting media details: {str(e)}"}, indent=4)
 
+def _fmt_duration(ms):
+    """Format a duration in milliseconds as HH:MM:SS."""
+    if not ms:
+        return None
+    minutes, seconds = divmod(ms // 1000, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
 # Helper function to extract media details
 def get_media_details(media):
     """Extract details from a media object and return as a dictionary."""
-    # Format duration as HH:MM:SS
-    def format_duration(ms):
-        if not ms:
-            return None
-        # Convert milliseconds to seconds
-        seconds = ms // 1000
-        # Calculate hours, minutes, seconds
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        seconds = seconds % 60
-        # Format as HH:MM:SS
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-    
     details = {
         'title': getattr(media, 'title', 'Unknown'),
         'type': getattr(media, 'type', 'unknown'),
@@ -316,7 +335,7 @@ def get_media_details(media):
         'added_at': getattr(media, 'addedAt', None).strftime("%Y-%m-%d %H:%M:%S") if hasattr(media, 'addedAt') and media.addedAt else None,
         'rating': getattr(media, 'rating', None),
         'content_rating': getattr(media, 'contentRating', None),
-        'duration': format_duration(getattr(media, 'duration', None)) if hasattr(media, 'duration') and media.duration else None,
+        'duration': _fmt_duration(getattr(media, 'duration', None)) if hasattr(media, 'duration') and media.duration else None,
         'studio': getattr(media, 'studio', None),
         'year': getattr(media, 'year', None),
     }
@@ -336,12 +355,13 @@ def get_media_details(media):
             # Make sure to keep the content rating
             details['content_rating'] = getattr(media, 'contentRating', None)
             
-            details['seasons_count'] = len(media.seasons()) if hasattr(media, 'seasons') and callable(media.seasons) else 0
-            details['episodes_count'] = len(media.episodes()) if hasattr(media, 'episodes') and callable(media.episodes) else 0
+            # Fetch the seasons once; the show's leafCount is its episode count, so no episode listing is needed for it
+            seasons = media.seasons()
+            details['seasons_count'] = len(seasons)
+            details['episodes_count'] = getattr(media, 'leafCount', 0) or 0
             
             # Add list of seasons with episodes
-            if hasattr(media, 'seasons') and callable(media.seasons):
-                seasons = media.seasons()
+            if seasons:
                 seasons_list = []
                 
                 for season in seasons:
@@ -354,21 +374,20 @@ def get_media_details(media):
                     }
                     
                     # Add episodes for this season
-                    if hasattr(season, 'episodes') and callable(season.episodes):
-                        try:
-                            episodes = season.episodes()
-                            season_data['episodes_count'] = len(episodes)
-                            
-                            for episode in episodes:
-                                episode_data = {
-                                    'title': getattr(episode, 'title', 'Unknown'),
-                                    'id': getattr(episode, 'ratingKey', None),
-                                    'episode_number': getattr(episode, 'index', None),
-                                    'duration': format_duration(getattr(episode, 'duration', None)) if hasattr(episode, 'duration') and episode.duration else None
-                                }
-                                season_data['episodes'].append(episode_data)
-                        except Exception as e:
-                            season_data['error'] = str(e)
+                    try:
+                        episodes = season.episodes()
+                        season_data['episodes_count'] = len(episodes)
+                        
+                        for episode in episodes:
+                            episode_data = {
+                                'title': getattr(episode, 'title', 'Unknown'),
+                                'id': getattr(episode, 'ratingKey', None),
+                                'episode_number': getattr(episode, 'index', None),
+                                'duration': _fmt_duration(getattr(episode, 'duration', None)) if hasattr(episode, 'duration') and episode.duration else None
+                            }
+                            season_data['episodes'].append(episode_data)
+                    except Exception as e:
+                        season_data['error'] = str(e)
                     
                     seasons_list.append(season_data)
                 
@@ -391,8 +410,10 @@ def get_media_details(media):
     elif media.type == 'artist':
         try:   
             details['summary'] = getattr(media, 'summary', None) if hasattr(media, 'summary') else None
-            details['albums_count'] = len(media.albums()) if hasattr(media, 'albums') and callable(media.albums) else 0
-            details['tracks_count'] = len(media.tracks()) if hasattr(media, 'tracks') and callable(media.tracks) else 0
+            # Fetch the albums once; their leafCount gives the track counts without listing any tracks
+            albums = media.albums()
+            details['albums_count'] = len(albums)
+            details['tracks_count'] = sum(getattr(album, 'leafCount', 0) or 0 for album in albums)
             details['rating'] = getattr(media, 'userRating', None) if hasattr(media, 'userRating') else getattr(media, 'rating', None)
             
             # Remove fields not needed for artists
@@ -406,15 +427,14 @@ def get_media_details(media):
                 del details['year']
             
             # Add list of albums
-            if hasattr(media, 'albums') and callable(media.albums):
-                albums = media.albums()
+            if albums:
                 albums_list = []
                 for album in albums:
                     albums_list.append({
                         'title': getattr(album, 'title', 'Unknown'),
                         'id': getattr(album, 'ratingKey', None),
                         'year': getattr(album, 'year', None),
-                        'tracks_count': len(album.tracks()) if hasattr(album, 'tracks') and callable(album.tracks) else 0
+                        'tracks_count': getattr(album, 'leafCount', 0) or 0
                     })
                 details['albums'] = albums_list
         except Exception as e:
@@ -435,44 +455,35 @@ def get_media_details(media):
         try:
             # Calculate total duration of all tracks
             total_duration_ms = 0
-            if hasattr(media, 'tracks') and callable(media.tracks):
-                tracks = media.tracks()
-                details['tracks_count'] = len(tracks)
+            tracks = media.tracks()
+            details['tracks_count'] = len(tracks)
+            
+            # Add list of tracks and calculate total duration
+            tracks_list = []
+            for track in tracks:
+                track_duration = getattr(track, 'duration', 0) or 0
+                total_duration_ms += track_duration
                 
-                # Add list of tracks and calculate total duration
-                tracks_list = []
-                for track in tracks:
-                    track_duration = getattr(track, 'duration', 0) or 0
-                    total_duration_ms += track_duration
-                    
-                    tracks_list.append({
-                        'title': getattr(track, 'title', 'Unknown'),
-                        'id': getattr(track, 'ratingKey', None),
-                        'track_number': getattr(track, 'index', None),
-                        'duration': format_duration(track_duration) if track_duration else None
-                    })
-                details['tracks'] = tracks_list
+                tracks_list.append({
+                    'title': getattr(track, 'title', 'Unknown'),
+                    'id': getattr(track, 'ratingKey', None),
+                    'track_number': getattr(track, 'index', None),
+                    'duration': _fmt_duration(track_duration) if track_duration else None
+                })
+            details['tracks'] = tracks_list
+            
+            # Format total duration
+            if total_duration_ms > 0:
+                # Calculate days, hours, minutes, seconds
+                minutes, seconds = divmod(total_duration_ms // 1000, 60)
+                hours, minutes = divmod(minutes, 60)
+                days, hours = divmod(hours, 24)
                 
-                # Format total duration
-                if total_duration_ms > 0:
-                    # Convert milliseconds to seconds
-                    seconds = total_duration_ms // 1000
-                    
-                    # Calculate days, hours, minutes, seconds
-                    days = seconds // 86400
-                    seconds %= 86400
-                    hours = seconds // 3600
-                    seconds %= 3600
-                    minutes = seconds // 60
-                    seconds %= 60
-                    
-                    # Format as [DDD:]HH:MM:SS, omitting days if 0
-                    if days > 0:
-                        details['duration'] = f"{days}:{hours:02d}:{minutes:02d}:{seconds:02d}"
-                    else:
-                        details['duration'] = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-            else:
-                details['tracks_count'] = 0
+                # Format as [DDD:]HH:MM:SS, omitting days if 0
+                if days > 0:
+                    details['duration'] = f"{days}:{hours:02d}:{minutes:02d}:{seconds:02d}"
+                else:
+                    details['duration'] = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
                 
         except Exception as e:
             details['summary'] = None
@@ -499,7 +510,7 @@ def get_media_details(media):
             del details['summary']
         
         # If track doesn't have year, try to get it from the album
-        if details['year'] is None and hasattr(media, 'album') and callable(getattr(media, 'album', None)):
+        if details['year'] is None:
             try:
                 album = media.album()
                 details['year'] = getattr(album, 'year', None)
@@ -676,7 +687,8 @@ async def media_edit_metadata(media_title: str, library_name: str = None,
         
         if not changes_made:
             return f"No changes were made to '{media.title}'."
-            
+        
+        _SEARCH_CACHE.clear()
         return f"Successfully updated metadata for '{media.title}'. Changes: {', '.join(changes_made)}."
     except Exception as e:
         return f"Error editing metadata: {str(e)}"
@@ -892,6 +904,7 @@ async def media_delete(media_title: str = None, media_id: int = None, library_na
                 # Perform the deletion
                 try:
                     media.delete()
+                    _SEARCH_CACHE.clear()
                     return json.dumps({
                         "deleted": True,
                         "title": media_title_to_return,
@@ -1003,6 +1016,7 @@ async def media_delete(media_title: str = None, media_id: int = None, library_na
                 # Perform the deletion
                 try:
                     media.delete()
+                    _SEARCH_CACHE.clear()
                     return json.dumps({
                         "deleted": True,
                         "title": media_title_to_return,
@@ -1,14 +1,212 @@
-from modules import mcp, connect_to_plex
+from modules import mcp, connect_to_plex_async as _plex, loaded_attr as _attr, retry_on_unauthorized, dump_json as _dump
 from typing import List
 from plexapi.playlist import Playlist # type: ignore
-from plexapi.exceptions import NotFound, BadRequest  # type: ignore
+from plexapi.exceptions import NotFound, BadRequest, Unauthorized  # type: ignore
+from plexapi import utils # type: ignore
 import os
+import io
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
 import base64
-import json
+import time
+from collections import defaultdict, namedtuple
+
+# Short-lived cache of playlist listings, keyed by server URL and query arguments
+_PLAYLIST_CACHE = {}
+PLAYLIST_CACHE_TTL = 10  # seconds
+
+def _get_playlists(plex, ttl: float = PLAYLIST_CACHE_TTL, **kwargs):
+    """Return plex.playlists(**kwargs), reusing a listing fetched within the last ttl seconds."""
+    key = (plex._baseurl, tuple(sorted(kwargs.items())))
+    now = time.monotonic()
+    cached = _PLAYLIST_CACHE.get(key)
+    if cached and now - cached[0] < ttl:
+        return cached[1]
+    
+    playlists = plex.playlists(**kwargs)
+    _PLAYLIST_CACHE[key] = (now, playlists)
+    return playlists
+
+# Lookups over a playlist listing: by_id maps ratingKeys to playlists,
+# by_title maps lowercased titles to lists of playlists
+PlaylistIndex = namedtuple('PlaylistIndex', ['playlists', 'by_id', 'by_title'])
+
+# Index of the cached playlist listing per server, rebuilt whenever the listing changes
+_PLAYLIST_INDEX = {}
+
+def _playlist_index(plex, playlists) -> PlaylistIndex:
+    """Return the PlaylistIndex for a playlist listing, building it on first use."""
+    index = _PLAYLIST_INDEX.get(plex._baseurl)
+    if index and index.playlists is playlists:
+        return index
+    
+    by_id = {}
+    by_title = defaultdict(list)
+    for p in playlists:
+        by_id[p.ratingKey] = p
+        by_title[p.title.lower()].append(p)
+    index = PlaylistIndex(playlists, by_id, by_title)
+    _PLAYLIST_INDEX[plex._baseurl] = index
+    return index
+
+def _find_playlist_by_id(plex, playlist_id: int):
+    """Fetch a playlist by its ratingKey, returning None if no playlist has that ID."""
+    # Answer from the cached listing when it is still fresh
+    cached = _PLAYLIST_CACHE.get((plex._baseurl, ()))
+    if cached and time.monotonic() - cached[0] < PLAYLIST_CACHE_TTL:
+        playlist = _playlist_index(plex, cached[1]).by_id.get(int(playlist_id))
+        if playlist:
+            return playlist
+    
+    try:
+        item = plex.fetchItem(int(playlist_id))
+    except Unauthorized:
+        # A subclass of BadRequest, but it means the token was rejected, not that the ID is bad
+        raise
+    except (NotFound, BadRequest):
+        return None
+    return item if isinstance(item, Playlist) else None
+
+def _find_playlists_by_title(plex, playlist_title: str):
+    """Return the playlists whose title matches playlist_title (case-insensitive)."""
+    return _playlist_index(plex, _get_playlists(plex)).by_title.get(playlist_title.lower(), [])
+
+async def _resolve_playlist(plex, playlist_title: str = None, playlist_id: int = None, matches_key: str = None):
+    """Find the playlist a tool call refers to, by ID if given, otherwise by title.
+    
+    Returns (playlist, None) on success, or (None, error_json) with a ready-made
+    response when no identifier was given, nothing matched, or the title matched
+    several playlists. Multiple matches are returned as a bare array, or wrapped
+    under matches_key when one is given.
+    """
+    # Validate that at least one identifier is provided
+    if not playlist_id and not playlist_title:
+        return None, _dump({"error": "Either playlist_id or playlist_title must be provided"})
+    
+    # If playlist_id is provided, use it to directly fetch the playlist
+    if playlist_id:
+        try:
+            playlist = await asyncio.to_thread(_find_playlist_by_id, plex, playlist_id)
+        except Unauthorized:
+            raise
+        except Exception as e:
+            return None, _dump({"error": f"Error fetching playlist by ID: {str(e)}"})
+        
+        if not playlist:
+            return None, _dump({"error": f"Playlist with ID '{playlist_id}' not found"})
+        return playlist, None
+    
+    # Search by title
+    matching_playlists = await asyncio.to_thread(_find_playlists_by_title, plex, playlist_title)
+    
+    if not matching_playlists:
+        return None, _dump({"error": f"No playlist found with title '{playlist_title}'"})
+    
+    # If multiple matching playlists, return list of matches with IDs
+    if len(matching_playlists) > 1:
+        matches = [_playlist_brief(p) for p in matching_playlists]
+        return None, _dump({matches_key: matches} if matches_key else matches)
+    
+    return matching_playlists[0], None
+
+# Shared users of the plex.tv account, keyed by server URL; changes rarely so a longer TTL is fine
+_USERS_CACHE = {}
+USERS_CACHE_TTL = 60  # seconds
+
+def _get_users_lookup(plex, ttl: float = USERS_CACHE_TTL):
+    """Return {lowercased username/email/title: MyPlexUser} for the account's users, reusing a recent lookup."""
+    now = time.monotonic()
+    cached = _USERS_CACHE.get(plex._baseurl)
+    if cached and now - cached[0] < ttl:
+        return cached[1]
+    
+    lookup = {}
+    for u in plex.myPlexAccount().users():
+        for name in (u.username, u.email, u.title):
+            if name:
+                lookup.setdefault(name.lower(), u)
+    _USERS_CACHE[plex._baseurl] = (now, lookup)
+    return lookup
+
+def _playlist_brief(p):
+    """Summarize a playlist for multiple-match responses without fetching its items."""
+    return {
+        "title": p.title,
+        "id": p.ratingKey,
+        "type": p.playlistType,
+        "item_count": _attr(p, 'leafCount')
+    }
+
+# Show and music sections list shows and artists by default; their playable items need their own search
+_SECTION_ITEM_LIBTYPES = {'show': 'episode', 'artist': 'track'}
+
+def _leaf_title(title: str) -> str:
+    """Return the item part of an "Artist - Track" / "Show - Episode" style title."""
+    return title.rsplit(' - ', 1)[-1]
+
+def _title_filters(titles: List[str]) -> list:
+    """Split titles into title= filter values: the comma-free ones together, each one with a comma alone.
+    
+    plexapi comma-joins a list of values into one OR filter, so a title containing
+    a comma would be split apart if it shared a request with other titles.
+    """
+    plain = [title for title in titles if ',' not in title]
+    return ([plain] if plain else []) + [title for title in titles if ',' in title]
+
+def _title_keys(item):
+    """Return the casefolded titles an item can be requested by.
+    
+    Tracks also answer to "Artist - Track" and "Artist - Album - Track",
+    episodes to "Show - Episode" and "Show - Season - Episode".
+    """
+    title = item.title.casefold()
+    if item.type not in ('track', 'episode'):
+        return (title,)
+    grandparent = (_attr(item, 'grandparentTitle') or '').casefold()
+    parent = (_attr(item, 'parentTitle') or '').casefold()
+    return (title, f"{grandparent} - {title}", f"{grandparent} - {parent} - {title}")
+
+MAX_POSTER_BYTES = 16 * 1024 * 1024  # 16 MB
+
+# Shared HTTP session for poster downloads so repeated uploads reuse connections
+_http = requests.Session()
+_http.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+_http.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
+def _poster_too_large(size) -> str:
+    """Return the error response for a poster over MAX_POSTER_BYTES."""
+    return _dump({"error": f"Poster file is too large ({size} bytes, limit is {MAX_POSTER_BYTES} bytes)"})
+
+def _download_poster(poster_url: str):
+    """Download a poster image, returning (bytes, None) or (None, error_json).
+    
+    The body is streamed and the download stops as soon as it passes MAX_POSTER_BYTES,
+    so an oversized or endless response is never held in memory.
+    """
+    with _http.get(poster_url, timeout=30, stream=True) as response:
+        if response.status_code != 200:
+            return None, _dump({"error": f"Failed to download image from URL: {response.status_code}"})
+        
+        content_type = response.headers.get("Content-Type", "")
+        if content_type and not content_type.startswith("image/"):
+            return None, _dump({"error": f"URL did not return an image (Content-Type: {content_type})"})
+        
+        # Refuse up front when the server says how big the body is
+        content_length = response.headers.get("Content-Length", "")
+        if content_length.isdigit() and int(content_length) > MAX_POSTER_BYTES:
+            return None, _poster_too_large(content_length)
+        
+        data = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            data += chunk
+            if len(data) > MAX_POSTER_BYTES:
+                return None, _poster_too_large(f"over {MAX_POSTER_BYTES}")
+        return bytes(data), None
 
 # Functions for playlists and collections
 @mcp.tool()
+@retry_on_unauthorized(lambda e: _dump({"error": str(e)}))
 async def playlist_list(library_name: str = None, content_type: str = None) -> str:
     """List all playlists on the Plex server.
     
@@ -17,56 +215,52 @@ async def playlist_list(library_name: str = None, content_type: str = None) -> s
         content_type: Optional content type to filter playlists (audio, video, photo)
     """
     try:
-        plex = connect_to_plex()
-        playlists = []
+        plex = await _plex()
+        params = {}
         
         # Filter by content type if specified
         if content_type:
             valid_types = ["audio", "video", "photo"]
-            if content_type.lower() not in valid_types:
-                return json.dumps({"error": f"Invalid content type. Valid types are: {', '.join(valid_types)}"}, indent=4)
-            playlists = plex.playlists(playlistType=content_type.lower())
-        else:
-            playlists = plex.playlists()
+            content_type = content_type.lower()
+            if content_type not in valid_types:
+                return _dump({"error": f"Invalid content type. Valid types are: {', '.join(valid_types)}"})
+            params["playlistType"] = content_type
         
         # Filter by library if specified
         if library_name:
             try:
-                library = plex.library.section(library_name)
-                # Use the section's playlists method directly
-                if content_type:
-                    playlists = library.playlists(playlistType=content_type.lower())
-                else:
-                    playlists = library.playlists()
+                library = await asyncio.to_thread(plex.library.section, library_name)
+                params["sectionID"] = library.key
             except NotFound:
-                return json.dumps({"error": f"Library '{library_name}' not found"}, indent=4)
+                return _dump({"error": f"Library '{library_name}' not found"})
+        
+        # Read the listing fields straight from the XML. Building Playlist objects would
+        # reload each playlist whose summary or duration is empty.
+        root = await asyncio.to_thread(plex.query, "/playlists", params=params or None)
         
         # Format playlist data (lightweight version - no items)
-        playlist_data = []
-        for playlist in playlists:
-            try:
-                playlist_data.append({
-                    "title": playlist.title,
-                    "key": playlist.key,
-                    "ratingKey": playlist.ratingKey,
-                    "type": playlist.playlistType,
-                    "summary": playlist.summary if hasattr(playlist, 'summary') else "",
-                    "duration": playlist.duration if hasattr(playlist, 'duration') else None,
-                    "item_count": playlist.leafCount if hasattr(playlist, 'leafCount') else None
-                })
-            except Exception as item_error:
-                # If there's an error with a specific playlist, include error info
-                playlist_data.append({
-                    "title": getattr(playlist, 'title', 'Unknown'),
-                    "key": getattr(playlist, 'key', 'Unknown'),
-                    "error": str(item_error)
-                })
+        cast = utils.cast
+        playlist_data = [
+            {
+                "title": attrib.get("title"),
+                "key": attrib.get("key"),
+                "ratingKey": cast(int, attrib.get("ratingKey")),
+                "type": attrib.get("playlistType"),
+                "summary": attrib.get("summary", ""),
+                "duration": cast(int, attrib.get("duration")),
+                "item_count": cast(int, attrib.get("leafCount"))
+            }
+            for attrib in (elem.attrib for elem in root.iter("Playlist"))
+        ]
         
-        return json.dumps(playlist_data, indent=4)
+        return _dump(playlist_data)
+    except Unauthorized:
+        raise
     except Exception as e:
-        return json.dumps({"error": str(e)}, indent=4)
+        return _dump({"error": str(e)})
 
 @mcp.tool()
+@retry_on_unauthorized(lambda e: _dump({"status": "error", "message": str(e)}))
 async def playlist_create(playlist_title: str, item_titles: List[str], library_name: str = None, summary: str = None) -> str:
     """Create a new playlist with specified items.
     
@@ -77,31 +271,73 @@ async def playlist_create(playlist_title: str, item_titles: List[str], library_n
         summary: Optional summary description for the playlist
     """
     try:
-        plex = connect_to_plex()
+        plex = await _plex()
         items = []
         
-        # Search for items in all libraries or specific library
-        for title in item_titles:
-            found = False
-            search_scope = plex.library.section(library_name) if library_name else plex.library
+        if item_titles:
+            # Search the specific library or every library
+            if library_name:
+                sections = [await asyncio.to_thread(plex.library.section, library_name)]
+            else:
+                sections = await asyncio.to_thread(plex.library.sections)
+            
+            # Search each section for all titles in one request (the title filter matches any of them),
+            # running the section searches concurrently
+            wanted = {title.casefold(): title for title in item_titles}
+            search_titles = list(wanted.values())
+            searches = [
+                asyncio.to_thread(section.search, title=title_filter)
+                for section in sections for title_filter in _title_filters(search_titles)
+            ]
             
-            # Search for the item
-            search_results = search_scope.search(title=title)
+            # Also search the episodes and tracks of show and music sections, which can be
+            # requested as "Show - Episode" or "Artist - Track"
+            leaf_titles = list({_leaf_title(title) for title in search_titles})
+            searches += [
+                asyncio.to_thread(section.search, title=title_filter, libtype=_SECTION_ITEM_LIBTYPES[section.type])
+                for section in sections if section.type in _SECTION_ITEM_LIBTYPES
+                for title_filter in _title_filters(leaf_titles)
+            ]
+            section_results = await asyncio.gather(*searches, return_exceptions=True)
             
-            if search_results:
-                items.append(search_results[0])
-                found = True
+            # A section that fails to search is skipped, unless the token was rejected
+            for search_results in section_results:
+                if isinstance(search_results, Unauthorized):
+                    raise search_results
             
-            if not found:
-                return json.dumps({"status": "error", "message": f"Item '{title}' not found"}, indent=4)
+            exact_matches = {}
+            partial_matches = {}
+            for search_results in section_results:
+                if isinstance(search_results, BaseException):
+                    continue
+                for item in search_results:
+                    item_title = item.title.casefold()
+                    for key in _title_keys(item):
+                        if key in wanted:
+                            exact_matches.setdefault(key, item)
+                    for needle in wanted:
+                        if needle not in partial_matches and needle in item_title:
+                            partial_matches[needle] = item
+            
+            for title in item_titles:
+                key = title.casefold()
+                item = exact_matches.get(key) or partial_matches.get(key)
+                if item is None:
+                    return _dump({"status": "error", "message": f"Item '{title}' not found"})
+                items.append(item)
         
         if not items:
-            return json.dumps({"status": "error", "message": "No items found for the playlist"}, indent=4)
+            return _dump({"status": "error", "message": "No items found for the playlist"})
         
         # Create the playlist
-        playlist = plex.createPlaylist(title=playlist_title, items=items, summary=summary)
+        playlist = await asyncio.to_thread(plex.createPlaylist, title=playlist_title, items=items)
         
-        return json.dumps({
+        # Regular playlists can't take a summary on creation, so set it with a single PUT
+        if summary:
+            await asyncio.to_thread(playlist.edit, summary=summary)
+        _PLAYLIST_CACHE.clear()
+        
+        return _dump({
             "status": "success", 
             "message": f"Playlist '{playlist_title}' created successfully",
             "data": {
@@ -110,11 +346,14 @@ async def playlist_create(playlist_title: str, item_titles: List[str], library_n
                 "ratingKey": playlist.ratingKey,
                 "item_count": len(items)
             }
-        }, indent=4)
+        })
+    except Unauthorized:
+        raise
     except Exception as e:
-        return json.dumps({"status": "error", "message": str(e)}, indent=4)
+        return _dump({"status": "error", "message": str(e)})
 
 @mcp.tool()
+@retry_on_unauthorized(lambda e: _dump({"error": str(e)}))
 async def playlist_edit(playlist_title: str = None, playlist_id: int = None, new_title: str = None, new_summary: str = None) -> str:
     """Edit a playlist's details such as title and summary.
     
@@ -125,88 +364,54 @@ async def playlist_edit(playlist_title: str = None, playlist_id: int = None, new
         new_summary: Optional new summary for the playlist
     """
     try:
-        plex = connect_to_plex()
-        
-        # Validate that at least one identifier is provided
-        if not playlist_id and not playlist_title:
-            return json.dumps({"error": "Either playlist_id or playlist_title must be provided"}, indent=4)
+        plex = await _plex()
         
         # Find the playlist
-        playlist = None
-        original_title = None
-        
-        # If playlist_id is provided, use it to directly fetch the playlist
-        if playlist_id:
-            try:
-                # Try fetching by ratingKey first
-                try:
-                    playlist = plex.fetchItem(playlist_id)
-                except:
-                    # If that fails, try finding by key in all playlists
-                    all_playlists = plex.playlists()
-                    playlist = next((p for p in all_playlists if p.ratingKey == playlist_id), None)
-                
-                if not playlist:
-                    return json.dumps({"error": f"Playlist with ID '{playlist_id}' not found"}, indent=4)
-                original_title = playlist.title
-            except Exception as e:
-                return json.dumps({"error": f"Error fetching playlist by ID: {str(e)}"}, indent=4)
-        else:
-            # Search by title
-            playlists = plex.playlists()
-            matching_playlists = [p for p in playlists if p.title.lower() == playlist_title.lower()]
-            
-            if not matching_playlists:
-                return json.dumps({"error": f"No playlist found with title '{playlist_title}'"}, indent=4)
-            
-            # If multiple matching playlists, return list of matches with IDs
-            if len(matching_playlists) > 1:
-                matches = []
-                for p in matching_playlists:
-                    matches.append({
-                        "title": p.title,
-                        "id": p.ratingKey,
-                        "type": p.playlistType,
-                        "item_count": p.leafCount if hasattr(p, 'leafCount') else len(p.items())
-                    })
-                
-                # Return as a direct array like playlist_list
-                return json.dumps(matches, indent=4)
-                
-            playlist = matching_playlists[0]
-            original_title = playlist.title
+        playlist, error = await _resolve_playlist(plex, playlist_title, playlist_id)
+        if error:
+            return error
+        original_title = playlist.title
         
         # Track changes
         changes = []
+        edits = {}
         
         # Update title if provided
         if new_title and new_title != playlist.title:
-            playlist.edit(title=new_title)
+            edits["title"] = new_title
             changes.append(f"title from '{original_title}' to '{new_title}'")
         
         # Update summary if provided
         if new_summary is not None:  # Allow empty summaries
             current_summary = playlist.summary if hasattr(playlist, 'summary') else ""
             if new_summary != current_summary:
-                playlist.edit(summary=new_summary)
+                edits["summary"] = new_summary
                 changes.append("summary")
         
+        # Apply all changes in a single request
+        if edits:
+            await asyncio.to_thread(playlist.edit, **edits)
+        
         if not changes:
-            return json.dumps({
+            return _dump({
                 "updated": False,
                 "title": playlist.title,
                 "message": "No changes made to the playlist"
-            }, indent=4)
-            
-        return json.dumps({
+            })
+        
+        _PLAYLIST_CACHE.clear()
+        return _dump({
             "updated": True,
             "title": new_title or playlist.title,
             "changes": changes
-        }, indent=4)
+        })
+    except Unauthorized:
+        raise
     except Exception as e:
-        return json.dumps({"error": str(e)}, indent=4)
+        return _dump({"error": str(e)})
 
 @mcp.tool()
+@retry_on_unauthorized(lambda e: _dump({"error": str(e)}))
 async def playlist_upload_poster(playlist_title: str = None, playlist_id: int = None, poster_url: str = None, poster_filepath: str = None) -> str:
     """Upload a poster image for a playlist.
     
@@ -217,112 +422,86 @@ async def playlist_upload_poster(playlist_title: str = None, playlist_id: int =
         poster_filepath: Local file path to an image to use as poster
     """
     try:
-        plex = connect_to_plex()
-        
-        # Validate that at least one identifier is provided
-        if not playlist_id and not playlist_title:
-            return json.dumps({"error": "Either playlist_id or playlist_title must be provided"}, indent=4)
+        plex = await _plex()
         
         # Check that at least one poster source is provided
         if not poster_url and not poster_filepath:
-            return json.dumps({"error": "Either poster_url or poster_filepath must be provided"}, indent=4)
+            return _dump({"error": "Either poster_url or poster_filepath must be provided"})
         
         # Find the playlist
-        playlist = None
-        
-        # If playlist_id is provided, use it to directly fetch the playlist
-        if playlist_id:
-            try:
-                # Try fetching by ratingKey first
-                try:
-                    playlist = plex.fetchItem(playlist_id)
-                except:
-                    # If that fails, try finding by key in all playlists
-                    all_playlists = plex.playlists()
-                    playlist = next((p for p in all_playlists if p.ratingKey == playlist_id), None)
-                
-                if not playlist:
-                    return json.dumps({"error": f"Playlist with ID '{playlist_id}' not found"}, indent=4)
-            except Exception as e:
-                return json.dumps({"error": f"Error fetching playlist by ID: {str(e)}"}, indent=4)
-        else:
-            # Search by title
-            playlists = plex.playlists()
-            matching_playlists = [p for p in playlists if p.title.lower() == playlist_title.lower()]
-            
-            if not matching_playlists:
-                return json.dumps({"error": f"No playlist found with title '{playlist_title}'"}, indent=4)
-            
-            # If multiple matching playlists, return list of matches with IDs
-            if len(matching_playlists) > 1:
-                matches = []
-                for p in matching_playlists:
-                    matches.append({
-                        "title": p.title,
-                        "id": p.ratingKey,
-                        "type": p.playlistType,
-                        "item_count": p.leafCount if hasattr(p, 'leafCount') else len(p.items())
-                    })
-                
-                # Return as a direct array like playlist_list
-                return json.dumps(matches, indent=4)
-                
-            playlist = matching_playlists[0]
+        playlist, error = await _resolve_playlist(plex, playlist_title, playlist_id)
+        if error:
+            return error
         
         # Upload from URL
         if poster_url:
             try:
-                response = requests.get(poster_url)
-                if response.status_code != 200:
-                    return json.dumps({"error": f"Failed to download image from URL: {response.status_code}"}, indent=4)
+                poster_data, download_error = await asyncio.to_thread(_download_poster, poster_url)
+                if download_error:
+                    return download_error
                 
-                # Upload the poster
-                playlist.uploadPoster(url=poster_url)
-                return json.dumps({
+                # Upload the downloaded bytes so Plex doesn't fetch the URL a second time
+                await asyncio.to_thread(playlist.uploadPoster, filepath=io.BytesIO(poster_data))
+                return _dump({
                     "updated": True,
                     "poster_source": "url",
                     "title": playlist.title
-                }, indent=4)
+                })
+            except Unauthorized:
+                raise
             except Exception as url_error:
-                return json.dumps({"error": f"Error uploading from URL: {str(url_error)}"}, indent=4)
+                return _dump({"error": f"Error uploading from URL: {str(url_error)}"})
         
         # Upload from file
         if poster_filepath:
-            if not os.path.exists(poster_filepath):
-                return json.dumps({"error": f"File not found: {poster_filepath}"}, indent=4)
-            
             try:
-                # Upload the poster
-                playlist.uploadPoster(filepath=poster_filepath)
-                return json.dumps({
-                    "updated": True,
-                    "poster_source": "file",
-                    "title": playlist.title
-                }, indent=4)
-            except Exception as file_error:
-                return json.dumps({"error": f"Error uploading from file: {str(file_error)}"}, indent=4)
+                poster_file = open(poster_filepath, "rb")
+            except FileNotFoundError:
+                return _dump({"error": f"File not found: {poster_filepath}"})
+            
+            with poster_file:
+                # Check the size of the file we opened before sending it to the server
+                poster_size = os.fstat(poster_file.fileno()).st_size
+                if poster_size > MAX_POSTER_BYTES:
+                    return _poster_too_large(poster_size)
+                
+                try:
+                    # Upload the poster from the already opened file
+                    await asyncio.to_thread(playlist.uploadPoster, filepath=poster_file)
+                    return _dump({
+                        "updated": True,
+                        "poster_source": "file",
+                        "title": playlist.title
+                    })
+                except Unauthorized:
+                    raise
+                except Exception as file_error:
+                    return _dump({"error": f"Error uploading from file: {str(file_error)}"})
         
+    except Unauthorized:
+        raise
     except Exception as e:
-        return json.dumps({"error": str(e)}, indent=4)
+        return _dump({"error": str(e)})
 
 @mcp.tool()
+@retry_on_unauthorized(lambda e: _dump({"status": "error", "message": str(e)}))
 async def playlist_copy_to_user(playlist_title: str = None, playlist_id: int = None, username: str = None) -> str:
     """Copy a playlist to another user account.
     
     Args:
         playlist_title: Title of the playlist to copy (optional if playlist_id is provided)
         playlist_id: ID of the playlist to copy (optional if playlist_title is provided)
-        username: Username of the user to copy the playlist to
+        username: Username, email or display name of the user to copy the playlist to
     """
     try:
-        plex = connect_to_plex()
+        plex = await _plex()
         
         # Validate that at least one identifier is provided
         if not playlist_id and not playlist_title:
-            return json.dumps({"status": "error", "message": "Either playlist_id or playlist_title must be provided"}, indent=4)
+            return _dump({"status": "error", "message": "Either playlist_id or playlist_title must be provided"})
         
         if not username:
-            return json.dumps({"status": "error", "message": "Username must be provided"}, indent=4)
+            return _dump({"status": "error", "message": "Username must be provided"})
         
         # Find the playlist
         playlist = None
@@ -330,63 +509,109 @@ async def playlist_copy_to_user(playlist_title: str = None, playlist_id: int = N
         # If playlist_id is provided, use it to directly fetch the playlist
         if playlist_id:
             try:
-                # Try fetching by ratingKey first
-                try:
-                    playlist = plex.fetchItem(playlist_id)
-                except:
-                    # If that fails, try finding by key in all playlists
-                    all_playlists = plex.playlists()
-                    playlist = next((p for p in all_playlists if p.ratingKey == playlist_id), None)
+                playlist = await asyncio.to_thread(_find_playlist_by_id, plex, playlist_id)
                 
                 if not playlist:
-                    return json.dumps({"status": "error", "message": f"Playlist with ID '{playlist_id}' not found"}, indent=4)
+                    return _dump({"status": "error", "message": f"Playlist with ID '{playlist_id}' not found"})
+            except Unauthorized:
+                raise
             except Exception as e:
-                return json.dumps({"status": "error", "message": f"Error fetching playlist by ID: {str(e)}"}, indent=4)
+                return _dump({"status": "error", "message": f"Error fetching playlist by ID: {str(e)}"})
         else:
             # Search by title
-            playlists = plex.playlists()
-            matching_playlists = [p for p in playlists if p.title.lower() == playlist_title.lower()]
+            matching_playlists = await asyncio.to_thread(_find_playlists_by_title, plex, playlist_title)
             
             if not matching_playlists:
-                return json.dumps({"status": "error", "message": f"No playlist found with title '{playlist_title}'"}, indent=4)
+                return _dump({"status": "error", "message": f"No playlist found with title '{playlist_title}'"})
             
             # If multiple matching playlists, return list of matches with IDs
             if len(matching_playlists) > 1:
-                matches = []
-                for p in matching_playlists:
-                    matches.append({
-                        "title": p.title,
-                        "id": p.ratingKey,
-                        "type": p.playlistType,
-                        "item_count": p.leafCount if hasattr(p, 'leafCount') else len(p.items())
-                    })
+                matches = [_playlist_brief(p) for p in matching_playlists]
                 
-                return json.dumps({
+                return _dump({
                     "status": "multiple_matches",
                     "message": f"Found {len(matching_playlists)} playlists with title '{playlist_title}'. Please specify the playlist ID.",
                     "matches": matches
-                }, indent=4)
+                })
                 
             playlist = matching_playlists[0]
         
         # Find the user
-        users = plex.myPlexAccount().users()
-        user = next((u for u in users if u.title.lower() == username.lower()), None)
+        users = await asyncio.to_thread(_get_users_lookup, plex)
+        user = users.get(username.lower())
         
         if not user:
-            return json.dumps({"status": "error", "message": f"User '{username}' not found"}, indent=4)
+            return _dump({"status": "error", "message": f"User '{username}' not found"})
         
         # Copy the playlist
-        playlist.copyToUser(user=user)
+        await asyncio.to_thread(playlist.copyToUser, user=user)
         
-        return json.dumps({
+        return _dump({
             "status": "success", 
             "message": f"Playlist '{playlist.title}' copied to user '{username}'"
-        }, indent=4)
+        })
+    except Unauthorized:
+        raise
     except Exception as e:
-        return json.dumps({"status": "error", "message": str(e)}, indent=4)
+        return _dump({"status": "error", "message": str(e)})
+
+MAX_CONCURRENT_TITLE_SEARCHES = 8  # titles searched at once by playlist_add_to
+
+async def _search_sections_for_title(sections, title: str):
+    """Search sections concurrently for title, returning (exact_match, possible_matches).
+    
+    The exact (case-insensitive) match is taken in library section order, so the
+    same item wins however fast each section answers. This returns as soon as every
+    section before the match has answered; searches still in flight then run to
+    completion in their worker threads and their results are discarded. Tracks and
+    episodes can also be requested as "Artist - Track" or "Show - Episode".
+    """
+    tgt = title.casefold()
+    tasks = []
+    for section in sections:
+        tasks.append(asyncio.ensure_future(asyncio.to_thread(section.search, title)))
+        # Also search the episodes and tracks of show and music sections by the item part of the title
+        libtype = _SECTION_ITEM_LIBTYPES.get(section.type)
+        if libtype:
+            tasks.append(asyncio.ensure_future(asyncio.to_thread(section.search, _leaf_title(title), libtype=libtype)))
+    possible_matches = []
+    checked = 0
+    try:
+        while checked < len(tasks):
+            await asyncio.wait(tasks[checked:], return_when=asyncio.FIRST_COMPLETED)
+            # Walk the finished searches in section order, stopping at the first one still running
+            while checked < len(tasks) and tasks[checked].done():
+                task = tasks[checked]
+                checked += 1
+                error = task.exception()
+                if isinstance(error, Unauthorized):
+                    raise error
+                if error is not None:
+                    # A failed section search counts as no results
+                    continue
+                search_results = task.result()
+                
+                exact = next((item for item in search_results if tgt in _title_keys(item)), None)
+                if exact:
+                    return exact, possible_matches
+                
+                # Add to possible matches if not an exact match
+                for item in search_results:
+                    possible_matches.append({
+                        "title": item.title,
+                        "id": item.ratingKey,
+                        "type": item.type,
+                        "year": item.year if hasattr(item, 'year') and item.year else None
+                    })
+    finally:
+        # Stops waiting on the remaining searches; requests already sent still complete
+        for task in tasks:
+            task.cancel()
+    
+    return None, possible_matches
 
 @mcp.tool()
+@retry_on_unauthorized(lambda e: _dump({"error": str(e)}))
 async def playlist_add_to(playlist_title: str = None, playlist_id: int = None, item_titles: List[str] = None, item_ids: List[int] = None) -> str:
     """Add items to a playlist.
     
@@ -397,57 +622,16 @@ async def playlist_add_to(playlist_title: str = None, playlist_id: int = None, i
         item_ids: List of media IDs to add to the playlist (optional if item_titles is provided)
     """
     try:
-        plex = connect_to_plex()
-        
-        # Validate that at least one identifier is provided
-        if not playlist_id and not playlist_title:
-            return json.dumps({"error": "Either playlist_id or playlist_title must be provided"}, indent=4)
+        plex = await _plex()
         
         # Validate that at least one item source is provided
         if (not item_titles or len(item_titles) == 0) and (not item_ids or len(item_ids) == 0):
-            return json.dumps({"error": "Either item_titles or item_ids must be provided"}, indent=4)
+            return _dump({"error": "Either item_titles or item_ids must be provided"})
         
         # Find the playlist
-        playlist = None
-        
-        # If playlist_id is provided, use it to directly fetch the playlist
-        if playlist_id:
-            try:
-                # Try fetching by ratingKey first
-                try:
-                    playlist = plex.fetchItem(playlist_id)
-                except:
-                    # If that fails, try finding by key in all playlists
-                    all_playlists = plex.playlists()
-                    playlist = next((p for p in all_playlists if p.ratingKey == playlist_id), None)
-                
-                if not playlist:
-                    return json.dumps({"error": f"Playlist with ID '{playlist_id}' not found"}, indent=4)
-            except Exception as e:
-                return json.dumps({"error": f"Error fetching playlist by ID: {str(e)}"}, indent=4)
-        else:
-            # Search by title
-            playlists = plex.playlists()
-            matching_playlists = [p for p in playlists if p.title.lower() == playlist_title.lower()]
-            
-            if not matching_playlists:
-                return json.dumps({"error": f"No playlist found with title '{playlist_title}'"}, indent=4)
-            
-            # If multiple matching playlists, return list of matches with IDs
-            if len(matching_playlists) > 1:
-                matches = []
-                for p in matching_playlists:
-                    matches.append({
-                        "title": p.title,
-                        "id": p.ratingKey,
-                        "type": p.playlistType,
-                        "item_count": p.leafCount if hasattr(p, 'leafCount') else len(p.items())
-                    })
-                
-                # Return as a direct array like playlist_list
-                return json.dumps({"Multiple Matches":matches}, indent=4)
-                
-            playlist = matching_playlists[0]
+        playlist, error = await _resolve_playlist(plex, playlist_title, playlist_id, matches_key="Multiple Matches")
+        if error:
+            return error
         
         # Find items to add
         items_to_add = []
@@ -455,49 +639,38 @@ async def playlist_add_to(playlist_title: str = None, playlist_id: int = None, i
         
         # If we have item IDs, try to add by ID first
         if item_ids and len(item_ids) > 0:
-            for item_id in item_ids:
-                try:
-                    # Try to fetch the item by ID
-                    item = plex.fetchItem(item_id)
-                    if item:
-                        items_to_add.append(item)
-                    else:
-                        not_found.append(str(item_id))
-                except Exception as e:
+            # Fetch all items by ID in a single request; IDs the server doesn't know are left out
+            rating_keys = [int(item_id) for item_id in item_ids]
+            try:
+                fetched = await asyncio.to_thread(plex.fetchItems, rating_keys)
+            except NotFound:
+                fetched = []
+            
+            fetched_by_id = {item.ratingKey: item for item in fetched}
+            for item_id, rating_key in zip(item_ids, rating_keys):
+                item = fetched_by_id.get(rating_key)
+                if item:
+                    items_to_add.append(item)
+                else:
                     not_found.append(str(item_id))
         
         # If we have item titles, search for them
         if item_titles and len(item_titles) > 0:
-            # Search all library sections
-            all_sections = plex.library.sections()
+            # Search all library sections except photo libraries
+            all_sections = await asyncio.to_thread(plex.library.sections)
+            search_sections = [section for section in all_sections if section.type != 'photo']
             
-            for title in item_titles:
-                found_item = None
-                possible_matches = []
-                
-                # Try to find the item in each section
-                for section in all_sections:
-                    # Skip photo libraries
-                    if section.type in ['photo']:
-                        continue
-                    
-                    search_results = section.search(title)
-                    if search_results:
-                        # Check for exact title match (case insensitive)
-                        exact_matches = [item for item in search_results if item.title.lower() == title.lower()]
-                        if exact_matches:
-                            found_item = exact_matches[0]
-                            break
-                        else:
-                            # Add to possible matches if not an exact match
-                            for item in search_results:
-                                possible_matches.append({
-                                    "title": item.title,
-                                    "id": item.ratingKey,
-                                    "type": item.type,
-                                    "year": item.year if hasattr(item, 'year') and item.year else None
-                                })
-                
+            # Search titles concurrently, a few at a time so large batches don't flood the server;
+            # each title stops waiting once its exact match is settled
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_TITLE_SEARCHES)
+            
+            async def search_title(title):
+                async with semaphore:
+                    return await _search_sections_for_title(search_sections, title)
+            
+            title_results = await asyncio.gather(*(search_title(title) for title in item_titles))
+            
+            for title, (found_item, possible_matches) in zip(item_titles, title_results):
                 if found_item:
                     items_to_add.append(found_item)
                 elif possible_matches:
@@ -514,31 +687,39 @@ async def playlist_add_to(playlist_title: str = None, playlist_id: int = None, i
             # If we have possible matches, return them
             if any(isinstance(item, dict) for item in not_found):
                 possible_matches_response = []
+                seen = set()
                 for item in not_found:
                     if isinstance(item, dict) and "possible_matches" in item:
                         for match in item["possible_matches"]:
-                            if match not in possible_matches_response:
+                            if match["id"] not in seen:
+                                seen.add(match["id"])
                                 possible_matches_response.append(match)
                     
-                return json.dumps({"Multiple Possible Matches Use ID" : possible_matches_response}, indent=4)
+                return _dump({"Multiple Possible Matches Use ID" : possible_matches_response})
             
-            return json.dumps({"error": "No matching items found to add to the playlist"}, indent=4)
+            return _dump({"error": "No matching items found to add to the playlist"})
         
-        # Add items to the playlist
-        for item in items_to_add:
-            playlist.addItems(item)
+        # Add all items to the playlist in a single request
+        await asyncio.to_thread(playlist.addItems, items_to_add)
+        _PLAYLIST_CACHE.clear()
         
-        return json.dumps({
+        # Reload the playlist metadata for the new item count instead of fetching every item
+        await asyncio.to_thread(playlist.reload)
+        
+        return _dump({
             "added": True,
             "title": playlist.title,
             "items_added": [item.title for item in items_to_add],
             "items_not_found": not_found,
-            "total_items": len(playlist.items())
-        }, indent=4)
+            "total_items": playlist.leafCount
+        })
+    except Unauthorized:
+        raise
     except Exception as e:
-        return json.dumps({"error": str(e)}, indent=4)
+        return _dump({"error": str(e)})
 
 @mcp.tool()
+@retry_on_unauthorized(lambda e: _dump({"error": str(e)}))
 async def playlist_remove_from(playlist_title: str = None, playlist_id: int = None, item_titles: List[str] = None) -> str:
     """Remove items from a playlist.
     
@@ -548,74 +729,40 @@ async def playlist_remove_from(playlist_title: str = None, playlist_id: int = No
         item_titles: List of media titles to remove from the playlist
     """
     try:
-        plex = connect_to_plex()
-        
-        # Validate that at least one identifier is provided
-        if not playlist_id and not playlist_title:
-            return json.dumps({"error": "Either playlist_id or playlist_title must be provided"}, indent=4)
+        plex = await _plex()
         
         if not item_titles or len(item_titles) == 0:
-            return json.dumps({"error": "At least one item title must be provided to remove"}, indent=4)
+            return _dump({"error": "At least one item title must be provided to remove"})
         
         # Find the playlist
-        playlist = None
-        
-        # If playlist_id is provided, use it to directly fetch the playlist
-        if playlist_id:
-            try:
-                # Try fetching by ratingKey first
-                try:
-                    playlist = plex.fetchItem(playlist_id)
-                except:
-                    # If that fails, try finding by key in all playlists
-                    all_playlists = plex.playlists()
-                    playlist = next((p for p in all_playlists if p.ratingKey == playlist_id), None)
-                
-                if not playlist:
-                    return json.dumps({"error": f"Playlist with ID '{playlist_id}' not found"}, indent=4)
-            except Exception as e:
-                return json.dumps({"error": f"Error fetching playlist by ID: {str(e)}"}, indent=4)
-        else:
-            # Search by title
-            playlists = plex.playlists()
-            matching_playlists = [p for p in playlists if p.title.lower() == playlist_title.lower()]
-            
-            if not matching_playlists:
-                return json.dumps({"error": f"No playlist found with title '{playlist_title}'"}, indent=4)
-            
-            # If multiple matching playlists, return list of matches with IDs
-            if len(matching_playlists) > 1:
-                matches = []
-                for p in matching_playlists:
-                    matches.append({
-                        "title": p.title,
-                        "id": p.ratingKey,
-                        "type": p.playlistType,
-                        "item_count": p.leafCount if hasattr(p, 'leafCount') else len(p.items())
-                    })
-                
-                # Return as a direct array like playlist_list
-                return json.dumps({"Multiple Matches":matches}, indent=4)
-                
-            playlist = matching_playlists[0]
+        playlist, error = await _resolve_playlist(plex, playlist_title, playlist_id, matches_key="Multiple Matches")
+        if error:
+            return error
         
         # Get current items in the playlist
-        playlist_items = playlist.items()
+        playlist_items = await asyncio.to_thread(playlist.items)
+        
+        # Index the playlist by title once, keeping the first entry for each title;
+        # tracks and episodes are also indexed as "Artist - Track" / "Show - Episode"
+        by_title = {}
+        for item in playlist_items:
+            for key in _title_keys(item):
+                by_title.setdefault(key, item)
         
         # Find items to remove
-        items_to_remove = []
+        to_remove = {}
         not_found = []
         
         for title in item_titles:
-            found = False
-            for item in playlist_items:
-                if item.title.lower() == title.lower():
-                    items_to_remove.append(item)
-                    found = True
-                    break
-            if not found:
+            item = by_title.get(title.casefold())
+            if item is not None:
+                # Key by ratingKey so titles resolving to the same item only remove it once
+                to_remove.setdefault(item.ratingKey, item)
+            else:
                 not_found.append(title)
         
+        items_to_remove = list(to_remove.values())
+        
         if not items_to_remove:
             # No items found to remove, return the current playlist contents
             current_items = []
@@ -626,28 +773,32 @@ async def playlist_remove_from(playlist_title: str = None, playlist_id: int = No
                     "id": item.ratingKey
                 })
             
-            return json.dumps({
+            return _dump({
                 "error": "No matching items found in the playlist to remove",
                 "playlist_title": playlist.title,
                 "playlist_id": playlist.ratingKey,
                 "current_items": current_items
-            }, indent=4)
+            })
         
         # Remove items from the playlist
         # Using removeItems (plural) since removeItem is deprecated
-        playlist.removeItems(items_to_remove)
+        await asyncio.to_thread(playlist.removeItems, items_to_remove)
+        _PLAYLIST_CACHE.clear()
         
-        return json.dumps({
+        return _dump({
             "removed": True,
             "title": playlist.title,
             "items_removed": [item.title for item in items_to_remove],
             "items_not_found": not_found,
-            "remaining_items": len(playlist.items())
-        }, indent=4)
+            "remaining_items": len(playlist_items) - len(items_to_remove)
+        })
+    except Unauthorized:
+        raise
     except Exception as e:
-        return json.dumps({"error": str(e)}, indent=4)
+        return _dump({"error": str(e)})
 
 @mcp.tool()
+@retry_on_unauthorized(lambda e: _dump({"error": str(e)}))
 async def playlist_delete(playlist_title: str = None, playlist_id: int = None) -> str:
     """Delete a playlist.
     
@@ -656,70 +807,33 @@ async def playlist_delete(playlist_title: str = None, playlist_id: int = None) -
         playlist_id: ID of the playlist to delete (optional if playlist_title is provided)
     """
     try:
-        plex = connect_to_plex()
-        
-        # Validate that at least one identifier is provided
-        if not playlist_id and not playlist_title:
-            return json.dumps({"error": "Either playlist_id or playlist_title must be provided"}, indent=4)
+        plex = await _plex()
         
         # Find the playlist
-        playlist = None
-        
-        # If playlist_id is provided, use it to directly fetch the playlist
-        if playlist_id:
-            try:
-                # Try fetching by ratingKey first
-                try:
-                    playlist = plex.fetchItem(playlist_id)
-                except:
-                    # If that fails, try finding by key in all playlists
-                    all_playlists = plex.playlists()
-                    playlist = next((p for p in all_playlists if p.ratingKey == playlist_id), None)
-                
-                if not playlist:
-                    return json.dumps({"error": f"Playlist with ID '{playlist_id}' not found"}, indent=4)
-            except Exception as e:
-                return json.dumps({"error": f"Error fetching playlist by ID: {str(e)}"}, indent=4)
-        else:
-            # Search by title
-            playlists = plex.playlists()
-            matching_playlists = [p for p in playlists if p.title.lower() == playlist_title.lower()]
-            
-            if not matching_playlists:
-                return json.dumps({"error": f"No playlist found with title '{playlist_title}'"}, indent=4)
-            
-            # If multiple matching playlists, return list of matches with IDs
-            if len(matching_playlists) > 1:
-                matches = []
-                for p in matching_playlists:
-                    matches.append({
-                        "title": p.title,
-                        "id": p.ratingKey,
-                        "type": p.playlistType,
-                        "item_count": p.leafCount if hasattr(p, 'leafCount') else len(p.items())
-                    })
-                
-                # Return as a direct array like playlist_list
-                return json.dumps(matches, indent=4)
-                
-            playlist = matching_playlists[0]
+        playlist, error = await _resolve_playlist(plex, playlist_title, playlist_id)
+        if error:
+            return error
         
         # Get the playlist title to return in the message
         playlist_title_to_return = playlist.title
         
         # Delete the playlist
-        playlist.delete()
+        await asyncio.to_thread(playlist.delete)
+        _PLAYLIST_CACHE.clear()
         
         # Return a simple object with the result
-        return json.dumps({
+        return _dump({
             "deleted": True,
             "title": playlist_title_to_return
-        }, indent=4)
+        })
         
+    except Unauthorized:
+        raise
     except Exception as e:
-        return json.dumps({"error": str(e)}, indent=4)
+        return _dump({"error": str(e)})
 
 @mcp.tool()
+@retry_on_unauthorized(lambda e: _dump({"status": "error", "message": f"Error getting playlist contents: {str(e)}"}))
 async def playlist_get_contents(playlist_title: str = None, playlist_id: int = None) -> str:
     """Get the contents of a playlist.
     
@@ -731,96 +845,83 @@ async def playlist_get_contents(playlist_title: str = None, playlist_id: int = N
         JSON object containing the playlist contents
     """
     try:
-        plex = connect_to_plex()
+        plex = await _plex()
         
-        # Validate that at least one identifier is provided
-        if not playlist_id and not playlist_title:
-            return json.dumps({"error": "Either playlist_id or playlist_title must be provided"}, indent=4)
+        playlist, error = await _resolve_playlist(plex, playlist_title, playlist_id)
+        if error:
+            return error
         
-        # If playlist_id is provided, use it to directly fetch the playlist
-        if playlist_id:
-            try:
-                playlist = None
-                # Try fetching by ratingKey first
-                try:
-                    playlist = plex.fetchItem(playlist_id)
-                    print(playlist.items())
-                except:
-                    # If that fails, try finding by key in all playlists
-                    all_playlists = plex.playlists()
-                    playlist = next((p for p in all_playlists if p.ratingKey == playlist_id), None)
-                
-                if not playlist:
-                    return json.dumps({"error": f"Playlist with ID '{playlist_id}' not found"}, indent=4)
-                
-                # Get playlist contents
-                print(playlist)
-                return get_playlist_contents(playlist)
-            except Exception as e:
-                if "500" in str(e):
-                    return json.dumps({"error": "Empty playlist"}, indent=4)
-                else:
-                    return json.dumps({"error": f"Error fetching playlist by ID: {str(e)}"}, indent=4)
-        
-        # If we get here, we're searching by title
-        all_playlists = plex.playlists()
-        matching_playlists = [p for p in all_playlists if p.title.lower() == playlist_title.lower()]
-        
-        # If no matching playlists
-        if not matching_playlists:
-            return json.dumps({"error": f"No playlist found with title '{playlist_title}'"}, indent=4)
-        
-        # If multiple matching playlists, return list of matches with IDs
-        if len(matching_playlists) > 1:
-            matches = []
-            for p in matching_playlists:
-                matches.append({
-                    "title": p.title,
-                    "id": p.ratingKey,
-                    "type": p.playlistType,
-                    "item_count": p.leafCount if hasattr(p, 'leafCount') else len(p.items())
-                })
-            
-            # Return as a direct array like playlist_list
-            return json.dumps(matches, indent=4)
-        
-        # Single match - get contents
-        return get_playlist_contents(matching_playlists[0])
+        return await _get_playlist_contents(playlist)
     
+    except Unauthorized:
+        raise
     except Exception as e:
-        return json.dumps({"status": "error", "message": f"Error getting playlist contents: {str(e)}"}, indent=4)
+        return _dump({"status": "error", "message": f"Error getting playlist contents: {str(e)}"})
+
+# (output key, plexapi attribute) pairs formatted for every playlist item
+_ITEM_FIELDS = (
+    ("title", "title"),
+    ("type", "type"),
+    ("ratingKey", "ratingKey"),
+    ("addedAt", "addedAt"),
+    ("duration", "duration"),
+    ("thumb", "thumb"),
+)
 
-def get_playlist_contents(playlist):
+# Full field templates per media type: the common fields followed by the type specific ones
+_ITEM_TYPE_FIELDS = {
+    'movie': _ITEM_FIELDS + (
+        ("year", "year"),
+    ),
+    'episode': _ITEM_FIELDS + (
+        ("show", "grandparentTitle"),
+        ("season", "parentTitle"),
+        ("seasonNumber", "parentIndex"),
+        ("episodeNumber", "index"),
+    ),
+    'track': _ITEM_FIELDS + (
+        ("artist", "grandparentTitle"),
+        ("album", "parentTitle"),
+        ("albumArtist", "originalTitle"),
+    ),
+}
+
+def _playlist_item_info(item, fields=None):
+    """Format a single playlist item for _get_playlist_contents.
+    
+    fields is the template from _ITEM_TYPE_FIELDS; by default it is looked up from the item's type.
+    """
+    if fields is None:
+        fields = _ITEM_TYPE_FIELDS.get(_attr(item, 'type'), _ITEM_FIELDS)
+    return {key: _attr(item, attr) for key, attr in fields}
+
+PLAYLIST_ENCODE_CHUNK = 500  # items formatted and encoded per batch
+
+def _encode_playlist_items(items, fields=None) -> str:
+    """Format and encode playlist items in batches, returning the comma-separated JSON objects.
+    
+    Only one batch of item dicts is alive at a time, which keeps memory flat for very large playlists.
+    """
+    chunks = []
+    for start in range(0, len(items), PLAYLIST_ENCODE_CHUNK):
+        batch = [_playlist_item_info(item, fields) for item in items[start:start + PLAYLIST_ENCODE_CHUNK]]
+        chunks.append(_dump(batch)[1:-1])
+    return ",".join(chunks)
+
+async def _get_playlist_contents(playlist):
     """Helper function to get formatted playlist contents."""
-    print(playlist)
+    # Plex errors out when asked for the items of an empty playlist, so don't ask
+    if _attr(playlist, 'leafCount') == 0:
+        return _dump({"error": "Empty playlist"})
+    
     try:
-        items = playlist.items()
-        playlist_items = []
-        
-        for item in items:
-            item_data = {
-                "title": item.title,
-                "type": item.type,
-                "ratingKey": item.ratingKey,
-                "addedAt": item.addedAt.strftime("%Y-%m-%d %H:%M:%S") if hasattr(item, 'addedAt') else None,
-                "duration": item.duration if hasattr(item, 'duration') else None,
-                "thumb": item.thumb if hasattr(item, 'thumb') else None
-            }
-            
-            # Add media-type specific fields
-            if item.type == 'movie':
-                item_data["year"] = item.year if hasattr(item, 'year') else None
-            elif item.type == 'episode':
-                item_data["show"] = item.grandparentTitle if hasattr(item, 'grandparentTitle') else None
-                item_data["season"] = item.parentTitle if hasattr(item, 'parentTitle') else None
-                item_data["seasonNumber"] = item.parentIndex if hasattr(item, 'parentIndex') else None
-                item_data["episodeNumber"] = item.index if hasattr(item, 'index') else None
-            elif item.type == 'track':
-                item_data["artist"] = item.grandparentTitle if hasattr(item, 'grandparentTitle') else None
-                item_data["album"] = item.parentTitle if hasattr(item, 'parentTitle') else None
-                item_data["albumArtist"] = item.originalTitle if hasattr(item, 'originalTitle') else None
-            
-            playlist_items.append(item_data)
+        items = await asyncio.to_thread(playlist.items)
+        
+        # Audio playlists only hold tracks, so pick their template once; video playlists can mix movies and episodes
+        fields = _ITEM_TYPE_FIELDS['track'] if playlist.playlistType == 'audio' else None
+        
+        # Encoding a large playlist is CPU bound, so keep it off the event loop too
+        items_json = await asyncio.to_thread(_encode_playlist_items, items, fields)
         
         playlist_info = {
             "title": playlist.title,
@@ -829,11 +930,12 @@ def get_playlist_contents(playlist):
             "type": playlist.playlistType,
             "summary": playlist.summary if hasattr(playlist, 'summary') else None,
             "duration": playlist.duration if hasattr(playlist, 'duration') else None,
-            "itemCount": len(playlist_items),
-            "items": playlist_items
+            "itemCount": len(items)
         }
         
-        # Return just the playlist info without status wrappers
-        return json.dumps(playlist_info, indent=4)
+        # Return just the playlist info without status wrappers, splicing the encoded items in as the last key
+        return _dump(playlist_info)[:-1] + ',"items":[' + items_json + ']}'
+    except Unauthorized:
+        raise
     except Exception as e:
-        return json.dumps({"error": f"Error formatting playlist contents: {str(e)}"}, indent=4)
\ No newline at end of file
+        return _dump({"error": f"Error formatting playlist contents: {str(e)}"})
\ No newline at end of file
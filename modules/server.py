@@ -1,11 +1,97 @@
-from modules import mcp, connect_to_plex
-import os
-from typing import Dict, List, Any, Optional
-import json
+from modules import mcp, connect_to_plex, connect_to_plex_async as _plex, retry_on_unauthorized, dump_json
+from plexapi.exceptions import Unauthorized # type: ignore
 import asyncio
+import collections
+import io
+import time
+import traceback
+import zipfile
+import xml.etree.ElementTree as ET
 import requests
 
+# Log file names inside the diagnostics bundle for the known log types
+_LOG_TYPE_MAP = {
+    'server': 'Plex Media Server.log',
+    'scanner': 'Plex Media Scanner.log',
+    'transcoder': 'Plex Transcoder Statistics.log',
+    'updater': 'Plex Update Service.log',
+    'tuner': 'Plex Tuner Service.log',
+    'scanner-deep-analysis': 'Plex Media Scanner Deep Analysis.log',
+    'credits': 'Plex Media Scanner Credits.log',
+    'chapter-thumbnails': 'Plex Media Scanner Chapter Thumbnails.log',
+    'crash-uploader': 'Plex Crash Uploader.log'
+}
+
+# A downloaded log bundle: when it was fetched, the zip bytes, its file names (in zip
+# order, as a set, and lowercased -> name), and the log tails decoded from it so far
+# (file name -> (total_lines, last lines))
+LogBundle = collections.namedtuple('LogBundle', ['ts', 'data', 'names', 'name_set', 'name_index', 'tails'])
+
+# Most recent LogBundle, reused for follow-up log reads
+_LOGS_CACHE = {"bundle": None}
+LOGS_CACHE_TTL = 15  # seconds
+
+def _download_logs() -> LogBundle:
+    """Return the server log bundle, downloading it at most once per LOGS_CACHE_TTL.
+    
+    Falls back to the previous bundle if the download fails. Callers keep working
+    on the bundle they were given even if a newer one replaces it meanwhile.
+    """
+    cached = _LOGS_CACHE["bundle"]
+    now = time.monotonic()
+    if cached is not None and now - cached.ts < LOGS_CACHE_TTL:
+        return cached
+    
+    try:
+        plex = connect_to_plex()
+        # Fetch the zip straight into memory; plex.downloadLogs() would write it
+        # to disk only for it to be read straight back
+        response = plex._session.get(plex.url('/diagnostics/logs'), headers={'X-Plex-Token': plex._token}, timeout=plex._timeout)
+        if response.status_code == 401:
+            raise Unauthorized(f"(401) unauthorized; {response.url}")
+        response.raise_for_status()
+        data = response.content
+        
+        # Read the file names once per bundle; on duplicate lowercased names the first file in the zip wins
+        try:
+            with zipfile.ZipFile(io.BytesIO(data), 'r') as zip_ref:
+                names = zip_ref.namelist()
+        except zipfile.BadZipFile:
+            raise ValueError(f"Downloaded data is not a valid zip file. Length: {len(data)}")
+        name_index = {f.lower(): f for f in reversed(names)}
+    except Unauthorized:
+        # Don't keep serving logs from before a rejected token
+        raise
+    except Exception:
+        if cached is None:
+            raise
+        return cached
+    
+    bundle = LogBundle(now, data, names, frozenset(names), name_index, {})
+    _LOGS_CACHE["bundle"] = bundle
+    return bundle
+
+LOG_TAIL_CACHE_LINES = 5000  # lines kept per log, enough for most tail requests
+
+def _log_tail(bundle: LogBundle, text, log_file_path: str, num_lines: int):
+    """Return (total_lines, last lines) for a log file in bundle; num_lines of 0 reads the whole log.
+    
+    At least LOG_TAIL_CACHE_LINES lines are kept on the bundle, so later tail reads
+    of it are sliced from memory instead of inflating the zip entry again.
+    """
+    cached = bundle.tails.get(log_file_path)
+    if cached and (0 < num_lines <= len(cached[1]) or len(cached[1]) == cached[0]):
+        return cached
+    
+    # A bounded deque keeps only the last lines, numbered so the total falls out for free
+    maxlen = max(num_lines, LOG_TAIL_CACHE_LINES) if num_lines > 0 else None
+    tail = collections.deque(enumerate(text, 1), maxlen=maxlen)
+    result = (tail[-1][0] if tail else 0, [line.rstrip('\n') for _, line in tail])
+    bundle.tails[log_file_path] = result
+    return result
+
 @mcp.tool()
+@retry_on_unauthorized(lambda e: f"Error getting Plex logs: {str(e)}")
 async def server_get_plex_logs(num_lines: int = 100, log_type: str = "server", start_line: int = None, list_files: bool = False, search_term: str = None) -> str:
     """Get Plex server logs.
     
@@ -19,24 +105,16 @@ async def server_get_plex_logs(num_lines: int = 100, log_type: str = "server", s
     Returns:
         String containing log lines, search results, or file list.
     """
+    if num_lines < 0:
+        return "num_lines must be 0 or greater (0 returns the whole log)."
+    
     try:
-        import zipfile
-        import io
-        import tempfile
-        import os
-        import shutil
-        import traceback
-        import fnmatch
-        
-        plex = connect_to_plex()
-            
-        # Download logs from the Plex server
-        # This returns a path to a zip file or raw zip data
-        logs_path_or_data = plex.downloadLogs()
+        # Download the logs zip from the Plex server, or reuse a bundle fetched moments ago
+        bundle = await asyncio.to_thread(_download_logs)
         
         # Function to process the zip file
         def process_zip(zip_ref):
-            all_files = zip_ref.namelist()
+            all_files = bundle.names
             
             # If list_files is requested, just return the list
             if list_files:
@@ -47,135 +125,97 @@ async def server_get_plex_logs(num_lines: int = 100, log_type: str = "server", s
             log_file_path = None
             
             # 1. Try mapping for known types
-            log_type_map = {
-                'server': 'Plex Media Server.log',
-                'scanner': 'Plex Media Scanner.log',
-                'transcoder': 'Plex Transcoder Statistics.log',
-                'updater': 'Plex Update Service.log',
-                'tuner': 'Plex Tuner Service.log',
-                'scanner-deep-analysis': 'Plex Media Scanner Deep Analysis.log',
-                'credits': 'Plex Media Scanner Credits.log',
-                'chapter-thumbnails': 'Plex Media Scanner Chapter Thumbnails.log',
-                'crash-uploader': 'Plex Crash Uploader.log'
-            }
-            
-            target_name = log_type_map.get(log_type.lower(), log_type)
+            target_name = _LOG_TYPE_MAP.get(log_type.lower(), log_type)
             
             # 2. Try exact match in zip
-            if target_name in all_files:
+            target_lower = target_name.lower()
+            
+            if target_name in bundle.name_set:
                 log_file_path = target_name
             else:
                 # 3. Try case-insensitive exact match
-                for f in all_files:
-                    if f.lower() == target_name.lower():
-                        log_file_path = f
-                        break
+                log_file_path = bundle.name_index.get(target_lower)
                 
                 # 4. Try partial match / suffix (e.g. searching for ".1.log")
                 if not log_file_path:
-                    candidates = []
-                    for f in all_files:
-                        if target_name.lower() in f.lower():
-                            candidates.append(f)
+                    candidates = [(lower, f) for f in all_files if target_lower in (lower := f.lower())]
                     
                     if len(candidates) == 1:
-                        log_file_path = candidates[0]
+                        log_file_path = candidates[0][1]
                     elif len(candidates) > 1:
                         # Prefer exact suffix match if possible? Or just return the first/shortest?
                         # Let's try to match if the user provided extension like .1.log
-                        for c in candidates:
-                            if c.endswith(target_name) or c.lower().endswith(target_name.lower()):
+                        for lower, c in candidates:
+                            if lower.endswith(target_lower):
                                 log_file_path = c
                                 break
                         if not log_file_path:
                             # Default to first candidate
-                            log_file_path = candidates[0]
+                            log_file_path = candidates[0][1]
 
             if not log_file_path:
                 return f"Could not find log file matching '{log_type}'. Available files:\n" + "\n".join(all_files[:20]) + ("\n..." if len(all_files) > 20 else "")
 
-            # Read the file
-            with zip_ref.open(log_file_path) as f:
-                content = f.read().decode('utf-8', errors='ignore')
-                
-            lines = content.splitlines()
-            total_lines = len(lines)
-            
-            # Handle Search
-            if search_term:
-                matches = []
-                search_lower = search_term.lower()
-                for i, line in enumerate(lines):
-                    if search_lower in line.lower():
-                        matches.append(f"Line {i+1}: {line}")
-                        
-                # Pagination/Limits for search results
-                # Only use start_line if provided, otherwise show first X matches? 
-                # Or use num_lines to limit count.
-                
-                total_matches = len(matches)
-                if total_matches == 0:
-                    return f"No matches found for '{search_term}' in {log_file_path}."
-                
-                start_idx = start_line if start_line is not None else 0
-                end_idx = min(start_idx + num_lines, total_matches)
+            # Stream the entry line by line instead of decoding the whole log;
+            # only the lines that end up in the response are kept in memory
+            with zip_ref.open(log_file_path) as raw:
+                text = io.TextIOWrapper(raw, encoding='utf-8', errors='ignore')
                 
-                result_lines = matches[start_idx:end_idx]
-                
-                header = f"Search results for '{search_term}' in {log_file_path} (Matches {start_idx+1}-{end_idx} of {total_matches}):\n\n"
-                return header + "\n".join(result_lines)
+                # Handle Search
+                if search_term:
+                    matches = []
+                    search_lower = search_term.lower()
+                    for i, line in enumerate(text):
+                        line = line.rstrip('\n')
+                        if search_lower in line.lower():
+                            matches.append(f"Line {i+1}: {line}")
+                            
+                    # Pagination/Limits for search results
+                    # Only use start_line if provided, otherwise show first X matches? 
+                    # Or use num_lines to limit count.
+                    
+                    total_matches = len(matches)
+                    if total_matches == 0:
+                        return f"No matches found for '{search_term}' in {log_file_path}."
+                    
+                    start_idx = start_line if start_line is not None else 0
+                    end_idx = min(start_idx + num_lines, total_matches)
+                    
+                    result_lines = matches[start_idx:end_idx]
+                    
+                    header = f"Search results for '{search_term}' in {log_file_path} (Matches {start_idx+1}-{end_idx} of {total_matches}):\n\n"
+                    return header + "\n".join(result_lines)
 
-            # Handle Standard Line Reading
-            if start_line is not None:
-                # Specific range requested
-                start_idx = max(0, start_line)
-                end_idx = min(start_idx + num_lines, total_lines)
-                result_lines = lines[start_idx:end_idx]
-                range_desc = f"lines {start_idx+1}-{end_idx}"
-            else:
-                # Tail requested (default)
-                # If num_lines >= total, return all. Else return last num_lines
-                if num_lines >= total_lines:
-                    result_lines = lines
-                    range_desc = f"all {total_lines} lines"
+                # Handle Standard Line Reading
+                if start_line is not None:
+                    # Specific range requested; keep the slice and count the rest
+                    start_idx = max(0, start_line)
+                    result_lines = []
+                    total_lines = 0
+                    for total_lines, line in enumerate(text, 1):
+                        if start_idx < total_lines <= start_idx + num_lines:
+                            result_lines.append(line.rstrip('\n'))
+                    end_idx = min(start_idx + num_lines, total_lines)
+                    range_desc = f"lines {start_idx+1}-{end_idx}"
                 else:
-                    result_lines = lines[-num_lines:]
-                    range_desc = f"last {len(result_lines)} lines"
+                    # Tail requested (default)
+                    total_lines, tail_lines = _log_tail(bundle, text, log_file_path, num_lines)
+                    result_lines = tail_lines[-num_lines:] if num_lines else tail_lines
+                    if not num_lines or num_lines >= total_lines:
+                        range_desc = f"all {total_lines} lines"
+                    else:
+                        range_desc = f"last {len(result_lines)} lines"
 
             return f"Log: {log_file_path} ({range_desc} of {total_lines}):\n\n" + "\n".join(result_lines)
 
 
-        # Handle zipfile content based on what we received
-        if isinstance(logs_path_or_data, str) and os.path.exists(logs_path_or_data) and logs_path_or_data.endswith('.zip'):
-            # We received a path to a zip file
-            try:
-                with zipfile.ZipFile(logs_path_or_data, 'r') as zip_ref:
-                    return process_zip(zip_ref)
-            finally:
-                # Clean up the downloaded zip if desired
-                try:
-                    os.remove(logs_path_or_data)
-                except:
-                    pass
-        else:
-            # We received the actual data or path to data - process in memory
-            if isinstance(logs_path_or_data, str):
-                # Check if it looks like a path but failed previous check?
-                # The mock/real connect_to_plex might return bytes or path.
-                # If it's a string and not a file, treat as bytes?
-                # Actually plexapi.downloadLogs() returns url or content? 
-                # Let's assume content if not file.
-                logs_path_or_data = logs_path_or_data.encode('utf-8')
-                
-            try:
-                # Create an in-memory zip file
-                zip_buffer = io.BytesIO(logs_path_or_data)
-                with zipfile.ZipFile(zip_buffer, 'r') as zip_ref:
-                    return process_zip(zip_ref)
-            except zipfile.BadZipFile:
-                # If it's not a zip, maybe it's just raw text? Unlikely for downloadLogs
-                return f"Downloaded data is not a valid zip file. Length: {len(logs_path_or_data)}"
+        # Open the zip straight from the downloaded bytes; _download_logs() already checked it is one
+        with zipfile.ZipFile(io.BytesIO(bundle.data), 'r') as zip_ref:
+            # Inflating and scanning the log is blocking work too
+            return await asyncio.to_thread(process_zip, zip_ref)
         
+    except Unauthorized:
+        raise
     except Exception as e:
         return f"Error getting Plex logs: {str(e)}\n{traceback.format_exc()}"
 
@@ -187,7 +227,7 @@ async def server_get_info() -> str:
         Dictionary containing server details including version, platform, etc.
     """
     try:
-        plex = connect_to_plex()
+        plex = await _plex()
         server_info = {
             "version": plex.version,
             "platform": plex.platform,
@@ -209,11 +249,12 @@ async def server_get_info() -> str:
         }
         
         # Format server information as JSON
-        return json.dumps({"status": "success", "data": server_info}, indent=4)
+        return dump_json({"status": "success", "data": server_info})
     except Exception as e:
-        return json.dumps({"status": "error", "message": str(e)}, indent=4)
+        return dump_json({"status": "error", "message": str(e)})
 
 @mcp.tool()
+@retry_on_unauthorized(lambda e: dump_json({"status": "error", "message": str(e)}))
 async def server_get_bandwidth(timespan: str = None, lan: str = None) -> str:
     """Get bandwidth statistics from the Plex server.
     
@@ -225,7 +266,7 @@ async def server_get_bandwidth(timespan: str = None, lan: str = None) -> str:
         Dictionary containing bandwidth statistics
     """
     try:
-        plex = connect_to_plex()
+        plex = await _plex()
         
         # Get bandwidth information
         bandwidth_stats = []
@@ -247,30 +288,45 @@ async def server_get_bandwidth(timespan: str = None, lan: str = None) -> str:
                 elif lan.lower() == 'false':
                     kwargs['lan'] = False
             
-            # Call bandwidth with the constructed kwargs
-            bandwidth_data = plex.bandwidth(**kwargs)
+            # Call bandwidth with the constructed kwargs; the account and device lists
+            # are separate requests on first use, so fetch all three concurrently
+            bandwidth_data, system_accounts, system_devices = await asyncio.gather(
+                asyncio.to_thread(plex.bandwidth, **kwargs),
+                asyncio.to_thread(plex.systemAccounts),
+                asyncio.to_thread(plex.systemDevices)
+            )
+            
+            # bandwidth.account() and bandwidth.device() scan the server's account and device
+            # lists on every call, so index them by ID once for all entries
+            accounts = {account.id: account for account in system_accounts}
+            devices = {device.id: device for device in system_devices}
             
             for bandwidth in bandwidth_data:
-                # Each bandwidth object has properties like accountID, at, bytes, deviceID, lan, timespan
+                # Each bandwidth object has accountID, at, bytes, deviceID, lan and timespan
+                account = accounts.get(bandwidth.accountID)
+                device = devices.get(bandwidth.deviceID)
                 stats = {
-                    "account": bandwidth.account().name if bandwidth.account() and hasattr(bandwidth.account(), 'name') else None,
-                    "device_id": bandwidth.deviceID if hasattr(bandwidth, 'deviceID') else None,
-                    "device_name": bandwidth.device().name if bandwidth.device() and hasattr(bandwidth.device(), 'name') else None,
-                    "platform": bandwidth.device().platform if bandwidth.device() and hasattr(bandwidth.device(), 'platform') else None,
-                    "client_identifier": bandwidth.device().clientIdentifier if bandwidth.device() and hasattr(bandwidth.device(), 'clientIdentifier') else None,
-                    "at": str(bandwidth.at) if hasattr(bandwidth, 'at') else None,
-                    "bytes": bandwidth.bytes if hasattr(bandwidth, 'bytes') else None,
-                    "is_local": bandwidth.lan if hasattr(bandwidth, 'lan') else None,
-                    "timespan (seconds)": bandwidth.timespan if hasattr(bandwidth, 'timespan') else None
+                    "account": account.name if account else None,
+                    "device_id": bandwidth.deviceID,
+                    "device_name": device.name if device else None,
+                    "platform": device.platform if device else None,
+                    "client_identifier": device.clientIdentifier if device else None,
+                    "at": str(bandwidth.at),
+                    "bytes": bandwidth.bytes,
+                    "is_local": bandwidth.lan,
+                    "timespan (seconds)": bandwidth.timespan
                 }
                 bandwidth_stats.append(stats)
         
         # Format bandwidth information as JSON
-        return json.dumps({"status": "success", "data": bandwidth_stats}, indent=4)
+        return dump_json({"status": "success", "data": bandwidth_stats})
+    except Unauthorized:
+        raise
     except Exception as e:
-        return json.dumps({"status": "error", "message": str(e)}, indent=4)
+        return dump_json({"status": "error", "message": str(e)})
 
 @mcp.tool()
+@retry_on_unauthorized(lambda e: dump_json({"status": "error", "message": str(e)}))
 async def server_get_current_resources() -> str:
     """Get resource usage information from the Plex server.
     
@@ -278,13 +334,13 @@ async def server_get_current_resources() -> str:
         Dictionary containing resource usage statistics
     """
     try:
-        plex = connect_to_plex()
+        plex = await _plex()
         
         # Get resource information
         resources_data = []
         
         if hasattr(plex, 'resources'):
-            server_resources = plex.resources()
+            server_resources = await asyncio.to_thread(plex.resources)
             
             for resource in server_resources:
                 # Create an entry for each resource timepoint
@@ -299,9 +355,15 @@ async def server_get_current_resources() -> str:
                 resources_data.append(resource_entry)
         
         # Format resource information as JSON
-        return json.dumps({"status": "success", "data": resources_data}, indent=4)
+        return dump_json({"status": "success", "data": resources_data})
+    except Unauthorized:
+        raise
     except Exception as e:
-        return json.dumps({"status": "error", "message": str(e)}, indent=4)
+        return dump_json({"status": "error", "message": str(e)})
+
+# Last successful server_get_butler_tasks response
+_BUTLER_CACHE = {"result": None, "ts": 0.0}
+BUTLER_CACHE_TTL = 30  # seconds
 
 @mcp.tool()
 async def server_get_butler_tasks() -> str:
@@ -310,8 +372,12 @@ async def server_get_butler_tasks() -> str:
     Returns:
         Dictionary containing information about scheduled and running butler tasks
     """
+    # The task schedule rarely changes; answer repeated calls from the last listing
+    if _BUTLER_CACHE["result"] is not None and time.monotonic() - _BUTLER_CACHE["ts"] < BUTLER_CACHE_TTL:
+        return _BUTLER_CACHE["result"]
+    
     try:
-        plex = connect_to_plex()
+        plex = await _plex()
         
         # Get the base URL and token from the Plex connection
         base_url = plex._baseurl
@@ -324,13 +390,10 @@ async def server_get_butler_tasks() -> str:
         # Disable SSL verification if using https
         verify = False if base_url.startswith('https') else True
         
-        response = requests.get(url, headers=headers, verify=verify)
+        response = await asyncio.to_thread(requests.get, url, headers=headers, verify=verify)
         
         if response.status_code == 200:
             # Parse the XML response
-            import xml.etree.ElementTree as ET
-            from xml.dom import minidom
-            
             try:
                 # Try to parse as XML first
                 root = ET.fromstring(response.text)
@@ -351,28 +414,30 @@ async def server_get_butler_tasks() -> str:
                     butler_tasks.append(task)
                 
                 # Return the butler tasks directly in the data field
-                return json.dumps({"status": "success", "data": butler_tasks}, indent=4)
+                result = dump_json({"status": "success", "data": butler_tasks})
+                _BUTLER_CACHE["result"] = result
+                _BUTLER_CACHE["ts"] = time.monotonic()
+                return result
             except ET.ParseError:
                 # Return the raw response if XML parsing fails
-                return json.dumps({
+                return dump_json({
                     "status": "error", 
                     "message": "Failed to parse XML response",
                     "raw_response": response.text
-                }, indent=4)
+                })
         else:
-            return json.dumps({
+            return dump_json({
                 "status": "error", 
                 "message": f"Failed to fetch butler tasks. Status code: {response.status_code}",
                 "response": response.text
-            }, indent=4)
+            })
             
     except Exception as e:
-        import traceback
-        return json.dumps({
+        return dump_json({
             "status": "error", 
             "message": str(e),
             "traceback": traceback.format_exc()
-        }, indent=4)
+        })
 
 @mcp.tool()
 async def server_get_alerts(timeout: int = 15) -> str:
@@ -385,7 +450,7 @@ async def server_get_alerts(timeout: int = 15) -> str:
         Dictionary containing server alerts and their details
     """
     try:
-        plex = connect_to_plex()
+        plex = await _plex()
         
         # Collection for alerts
         alerts_data = []
@@ -439,9 +504,9 @@ async def server_get_alerts(timeout: int = 15) -> str:
         print(f"Alert listener stopped after {timeout} seconds.")
         
         # Format alerts as JSON
-        return json.dumps({"status": "success", "data": alerts_data}, indent=4)
+        return dump_json({"status": "success", "data": alerts_data})
     except Exception as e:
-        return json.dumps({"status": "error", "message": str(e)}, indent=4)
+        return dump_json({"status": "error", "message": str(e)})
 
 @mcp.tool()
 async def server_run_butler_task(task_name: str) -> str:
@@ -454,7 +519,7 @@ async def server_run_butler_task(task_name: str) -> str:
         Success or error message
     """
     try:
-        plex = connect_to_plex()
+        plex = await _plex()
         
         # Call the runButlerTask method directly on the PlexServer object
         # Valid task names: 'BackupDatabase', 'CheckForUpdates', 'CleanOldBundles', 
@@ -474,14 +539,16 @@ async def server_run_butler_task(task_name: str) -> str:
         verify = False if base_url.startswith('https') else True
         
         print(f"Running butler task: {task_name}")
-        response = requests.post(url, headers=headers, verify=verify)
+        response = await asyncio.to_thread(requests.post, url, headers=headers, verify=verify)
         
         print(f"Response status: {response.status_code}")
         print(f"Response text: {response.text}")
         
         # Add 202 Accepted to the list of successful status codes
         if response.status_code in [200, 201, 202, 204]:
-            return json.dumps({"status": "success", "message": f"Butler task '{task_name}' started successfully"}, indent=4)
+            # The task's last run has changed, so the cached listing is stale
+            _BUTLER_CACHE["result"] = None
+            return dump_json({"status": "success", "message": f"Butler task '{task_name}' started successfully"})
         else:
             # For error responses, extract the status code and response text in a more readable format
             error_message = f"Failed to run butler task. Status code: {response.status_code}"
@@ -499,20 +566,20 @@ async def server_run_butler_task(task_name: str) -> str:
                 if h1_match and h1_match.group(1):
                     error_message = f"Failed to run butler task: {h1_match.group(1)}"
             
-            return json.dumps({
+            return dump_json({
                 "status": "error", 
                 "message": error_message
-            }, indent=4)
+            })
             
     except Exception as e:
-        import traceback
-        return json.dumps({
+        return dump_json({
             "status": "error", 
             "message": str(e),
             "traceback": traceback.format_exc()
-        }, indent=4)
+        })
 
 @mcp.tool()
+@retry_on_unauthorized(lambda e: dump_json({"status": "error", "message": f"Error emptying trash: {str(e)}"}))
 async def server_empty_trash(library_name: str = None) -> str:
     """Empty trash for a specific library or all libraries.
     
@@ -525,11 +592,11 @@ async def server_empty_trash(library_name: str = None) -> str:
         Success or error message
     """
     try:
-        plex = connect_to_plex()
+        plex = await _plex()
         
         if library_name:
             # Find the specific library
-            all_sections = plex.library.sections()
+            all_sections = await asyncio.to_thread(plex.library.sections)
             target_section = None
             
             for section in all_sections:
@@ -538,32 +605,35 @@ async def server_empty_trash(library_name: str = None) -> str:
                     break
             
             if not target_section:
-                return json.dumps({
+                return dump_json({
                     "status": "error",
                     "message": f"Library '{library_name}' not found. Available libraries: {', '.join([s.title for s in all_sections])}"
-                }, indent=4)
+                })
             
             # Empty trash for the specific library
-            target_section.emptyTrash()
-            return json.dumps({
+            await asyncio.to_thread(target_section.emptyTrash)
+            return dump_json({
                 "status": "success",
                 "message": f"Trash emptied for library '{target_section.title}'."
-            }, indent=4)
+            })
         else:
             # Empty trash for all libraries
-            plex.library.emptyTrash()
-            return json.dumps({
+            await asyncio.to_thread(plex.library.emptyTrash)
+            return dump_json({
                 "status": "success",
                 "message": "Trash emptied for all libraries."
-            }, indent=4)
+            })
             
+    except Unauthorized:
+        raise
     except Exception as e:
-        return json.dumps({
+        return dump_json({
             "status": "error",
             "message": f"Error emptying trash: {str(e)}"
-        }, indent=4)
+        })
 
 @mcp.tool()
+@retry_on_unauthorized(lambda e: dump_json({"status": "error", "message": f"Error optimizing database: {str(e)}"}))
 async def server_optimize_database() -> str:
     """Optimize the Plex database.
     
@@ -573,23 +643,26 @@ async def server_optimize_database() -> str:
         Success or error message
     """
     try:
-        plex = connect_to_plex()
+        plex = await _plex()
         
         # Optimize the database
-        plex.library.optimize()
+        await asyncio.to_thread(plex.library.optimize)
         
-        return json.dumps({
+        return dump_json({
             "status": "success",
             "message": "Database optimization started. This may take some time to complete."
-        }, indent=4)
+        })
             
+    except Unauthorized:
+        raise
     except Exception as e:
-        return json.dumps({
+        return dump_json({
             "status": "error",
             "message": f"Error optimizing database: {str(e)}"
-        }, indent=4)
+        })
 
 @mcp.tool()
+@retry_on_unauthorized(lambda e: dump_json({"status": "error", "message": f"Error cleaning bundles: {str(e)}"}))
 async def server_clean_bundles() -> str:
     """Clean unused media bundles.
     
@@ -599,18 +672,20 @@ async def server_clean_bundles() -> str:
         Success or error message
     """
     try:
-        plex = connect_to_plex()
+        plex = await _plex()
         
         # Clean bundles
-        plex.library.cleanBundles()
+        await asyncio.to_thread(plex.library.cleanBundles)
         
-        return json.dumps({
+        return dump_json({
             "status": "success",
             "message": "Bundle cleaning started. This removes unused metadata and artwork."
-        }, indent=4)
+        })
             
+    except Unauthorized:
+        raise
     except Exception as e:
-        return json.dumps({
+        return dump_json({
             "status": "error",
             "message": f"Error cleaning bundles: {str(e)}"
-        }, indent=4)
\ No newline at end of file
+        })
\ No newline at end of file
@@ -1,6 +1,13 @@
-import json
-from typing import Optional
-from modules import mcp, connect_to_plex
+from modules import mcp, connect_to_plex, dump_json
+
+# (output key, PlexClient attribute) pairs reported for each session's player
+_PLAYER_FIELDS = (
+    ("ip", "address"),
+    ("platform", "platform"),
+    ("product", "product"),
+    ("device", "device"),
+    ("version", "version"),
+)
 
 # Functions for sessions and playback
 @mcp.tool()
@@ -17,7 +24,7 @@ async def sessions_get_active(unused: str = None) -> str:
         sessions = plex.sessions()
         
         if not sessions:
-            return json.dumps({
+            return dump_json({
                 "status": "success",
                 "message": "No active sessions found.",
                 "sessions_count": 0,
@@ -66,30 +73,7 @@ async def sessions_get_active(unused: str = None) -> str:
             
             # Player information
             if player:
-                player_info = {
-                }
-                
-                # Add IP address if available
-                if hasattr(player, 'address'):
-                    player_info["ip"] = player.address
-                
-                # Add platform information if available
-                if hasattr(player, 'platform'):
-                    player_info["platform"] = player.platform
-                
-                # Add product information if available
-                if hasattr(player, 'product'):
-                    player_info["product"] = player.product
-                
-                # Add device information if available
-                if hasattr(player, 'device'):
-                    player_info["device"] = player.device
-                
-                # Add version information if available
-                if hasattr(player, 'version'):
-                    player_info["version"] = player.version
-                
-                session_info["player"] = player_info
+                session_info["player"] = {key: getattr(player, attr, None) for key, attr in _PLAYER_FIELDS}
             
             # Add playback information
             if hasattr(session, 'viewOffset') and hasattr(session, 'duration'):
@@ -148,7 +132,7 @@ async def sessions_get_active(unused: str = None) -> str:
             
             sessions_data.append(session_info)
         
-        return json.dumps({
+        return dump_json({
             "status": "success",
             "message": f"Found {len(sessions)} active sessions",
             "sessions_count": len(sessions),
@@ -156,9 +140,9 @@ async def sessions_get_active(unused: str = None) -> str:
             "direct_play_count": direct_play_count,
             "total_bitrate_kbps": total_bitrate,
             "sessions": sessions_data
-        }, indent=2)
+        })
     except Exception as e:
-        return json.dumps({
+        return dump_json({
             "status": "error",
             "message": f"Error getting active sessions: {str(e)}"
         })
@@ -177,7 +161,7 @@ async def sessions_get_media_playback_history(media_title: str = None, library_n
         
         # Check if we have at least one identifier
         if not media_title and not media_id:
-            return json.dumps({
+            return dump_json({
                 "status": "error",
                 "message": "Either media_title or media_id must be provided."
             })
@@ -191,7 +175,7 @@ async def sessions_get_media_playback_history(media_title: str = None, library_n
                 # fetchItem takes a rating key and returns the media object
                 media = plex.fetchItem(media_id)
             except Exception as e:
-                return json.dumps({
+                return dump_json({
                     "status": "error",
                     "message": f"Media with ID '{media_id}' not found: {str(e)}"
                 })
@@ -202,7 +186,7 @@ async def sessions_get_media_playback_history(media_title: str = None, library_n
                     library = plex.library.section(library_name)
                     results = library.search(title=media_title)
                 except Exception:
-                    return json.dumps({
+                    return dump_json({
                         "status": "error",
                         "message": f"Library '{library_name}' not found."
                     })
@@ -210,7 +194,7 @@ async def sessions_get_media_playback_history(media_title: str = None, library_n
                 results = plex.search(media_title)
             
             if not results:
-                return json.dumps({
+                return dump_json({
                     "status": "error",
                     "message": f"No media found matching '{media_title}'."
                 })
@@ -240,11 +224,11 @@ async def sessions_get_media_playback_history(media_title: str = None, library_n
                     
                     matches.append(item_info)
                 
-                return json.dumps({
+                return dump_json({
                     "status": "multiple_matches",
                     "message": f"Multiple items found with title '{media_title}'. Please specify a library, use a more specific title, or use one of the media_id values below.",
                     "matches": matches
-                }, indent=2)
+                })
             
             media = results[0]
         
@@ -279,7 +263,7 @@ async def sessions_get_media_playback_history(media_title: str = None, library_n
             history_items = media.history()
             
             if not history_items:
-                return json.dumps({
+                return dump_json({
                     "status": "success",
                     "message": f"No playback history found for '{formatted_title}'.",
                     "media": media_info,
@@ -321,12 +305,12 @@ async def sessions_get_media_playback_history(media_title: str = None, library_n
                 history_entry["device"] = device_name
                 history_data.append(history_entry)
             
-            return json.dumps({
+            return dump_json({
                 "status": "success",
                 "media": media_info,
                 "play_count": len(history_items),
                 "history": history_data
-            }, indent=2)
+            })
             
         except AttributeError:
             # Fallback if history() method is not available
@@ -335,7 +319,7 @@ async def sessions_get_media_playback_history(media_title: str = None, library_n
             last_viewed_at = getattr(media, 'lastViewedAt', None)
             
             if view_count == 0:
-                return json.dumps({
+                return dump_json({
                     "status": "success", 
                     "message": f"No one has watched '{formatted_title}' yet.",
                     "media": media_info,
@@ -357,10 +341,10 @@ async def sessions_get_media_playback_history(media_title: str = None, library_n
             if account_info:
                 result["viewed_by"] = [account.title for account in account_info]
             
-            return json.dumps(result, indent=2)
+            return dump_json(result)
         
     except Exception as e:
-        return json.dumps({
+        return dump_json({
             "status": "error",
             "message": f"Error getting media playback history: {str(e)}"
         })
\ No newline at end of file
@@ -0,0 +1,57 @@
+import pytest
+
+pytest.importorskip("mcp")
+pytest.importorskip("plexapi")
+
+from modules import playlist  # noqa: E402
+
+
+class _FakePlaylist:
+    def __init__(self, key, title):
+        self.ratingKey = key
+        self.title = title
+
+
+class _FakePlex:
+    _baseurl = "http://plex.test"
+
+    def __init__(self):
+        self.listings = 0
+        self.fetches = 0
+
+    def playlists(self):
+        self.listings += 1
+        return [_FakePlaylist(1, "Mix"), _FakePlaylist(2, "mix"), _FakePlaylist(3, "Chill")]
+
+    def fetchItem(self, key):
+        self.fetches += 1
+        raise AssertionError("ID lookups should be answered from the cached listing")
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    playlist._PLAYLIST_CACHE.clear()
+    yield
+    playlist._PLAYLIST_CACHE.clear()
+
+
+def test_lookups_share_one_listing():
+    plex = _FakePlex()
+
+    assert [p.ratingKey for p in playlist._find_playlists_by_title(plex, "MIX")] == [1, 2]
+    assert [p.ratingKey for p in playlist._find_playlists_by_title(plex, "chill")] == [3]
+    assert playlist._find_playlists_by_title(plex, "missing") == []
+    assert playlist._find_playlist_by_id(plex, 3).title == "Chill"
+
+    assert plex.listings == 1
+    assert plex.fetches == 0
+
+
+def test_clearing_the_cache_refetches():
+    plex = _FakePlex()
+
+    playlist._find_playlists_by_title(plex, "Mix")
+    playlist._PLAYLIST_CACHE.clear()
+    playlist._find_playlists_by_title(plex, "Mix")
+
+    assert plex.listings == 2
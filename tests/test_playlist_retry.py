@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("mcp")
+pytest.importorskip("plexapi")
+
+import modules  # noqa: E402
+from modules import playlist  # noqa: E402
+from plexapi.exceptions import Unauthorized  # noqa: E402
+
+
+class _FakePlaylist:
+    title = "Mix"
+    ratingKey = 1
+    deleted = False
+
+    def delete(self):
+        self.deleted = True
+
+
+class _FakePlex:
+    """A server whose token is rejected until the connection is reset."""
+
+    _baseurl = "http://plex.test"
+
+    def __init__(self, state):
+        self.state = state
+
+    def fetchItem(self, key):
+        if not self.state["reset"]:
+            raise Unauthorized("(401) unauthorized")
+        return self.state["playlist"]
+
+
+def test_rejected_token_reconnects_and_retries(monkeypatch):
+    state = {"reset": False, "connects": 0, "playlist": _FakePlaylist()}
+
+    async def fake_plex():
+        state["connects"] += 1
+        return _FakePlex(state)
+
+    def fake_reset():
+        state["reset"] = True
+
+    monkeypatch.setattr(playlist, "_plex", fake_plex)
+    monkeypatch.setattr(playlist, "Playlist", _FakePlaylist)
+    monkeypatch.setattr(modules, "reset_plex_connection", fake_reset)
+
+    result = json.loads(asyncio.run(playlist.playlist_delete(playlist_id=1)))
+
+    assert result == {"deleted": True, "title": "Mix"}
+    assert state["reset"] and state["connects"] == 2
+    assert state["playlist"].deleted
+
+
+def test_second_rejection_reports_the_error(monkeypatch):
+    resets = []
+
+    async def fake_plex():
+        return _FakePlex({"reset": False})
+
+    monkeypatch.setattr(playlist, "_plex", fake_plex)
+    monkeypatch.setattr(modules, "reset_plex_connection", lambda: resets.append(1))
+
+    result = json.loads(asyncio.run(playlist.playlist_delete(playlist_id=1)))
+
+    assert result == {"error": "(401) unauthorized"}
+    assert len(resets) == 2
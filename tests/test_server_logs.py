@@ -0,0 +1,62 @@
+import asyncio
+import importlib
+import io
+import zipfile
+
+import pytest
+
+pytest.importorskip("mcp")
+pytest.importorskip("plexapi")
+
+from modules.server import LogBundle, _log_tail  # noqa: E402
+
+# modules.server is also the name of the cached PlexServer in modules/__init__.py
+server = importlib.import_module("modules.server")
+
+ALL_LINES = [f"line {i}" for i in range(1, 11)]
+
+
+def _log(n):
+    return io.StringIO("".join(f"line {i}\n" for i in range(1, n + 1)))
+
+
+def _bundle(files=None):
+    data = b""
+    names = []
+    if files:
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w") as zf:
+            for name, text in files.items():
+                zf.writestr(name, text)
+        data = buf.getvalue()
+        names = list(files)
+    return LogBundle(0.0, data, names, frozenset(names), {n.lower(): n for n in names}, {})
+
+
+def test_zero_lines_returns_whole_log():
+    total, lines = _log_tail(_bundle(), _log(10), "a.log", 0)
+    assert total == 10
+    assert lines == ALL_LINES
+
+
+def test_tail_is_reused_from_the_bundle():
+    bundle = _bundle()
+    _log_tail(bundle, _log(10), "a.log", 3)
+    # A second read of the same file is served from bundle.tails, not the stream
+    total, lines = _log_tail(bundle, io.StringIO(""), "a.log", 0)
+    assert total == 10
+    assert lines == ALL_LINES
+
+
+@pytest.mark.parametrize("num_lines, header, expected", [
+    (0, "all 10 lines of 10", ALL_LINES),
+    (3, "last 3 lines of 10", ALL_LINES[-3:]),
+    (50, "all 10 lines of 10", ALL_LINES),
+])
+def test_tail_header(monkeypatch, num_lines, header, expected):
+    bundle = _bundle({"Plex Media Server.log": "".join(f"{line}\n" for line in ALL_LINES)})
+    monkeypatch.setattr(server, "_download_logs", lambda: bundle)
+
+    result = asyncio.run(server.server_get_plex_logs(num_lines=num_lines))
+
+    assert result == f"Log: Plex Media Server.log ({header}):\n\n" + "\n".join(expected)